@@ -59,4 +59,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload the integration."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+    # final filter state save, awaited so that a reload reads it
+    runtime = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+    if runtime is not None:
+        await runtime.async_stop()
+
     return unload_ok
\ No newline at end of file
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# sensors added within this delay share one recorder query
+BACKFILL_DELAY = 1.0
+
+
+def _fetch_history(hass, entity_ids, start, end):
+    """Recorder executor job: numeric (timestamp, value) rows per entity."""
+    from homeassistant.components.recorder import history
+
+    # compressed minimal rows: {"s": state, "lu": timestamp}, no State objects
+    states = history.get_significant_states(
+        hass,
+        datetime.fromtimestamp(start, timezone.utc),
+        datetime.fromtimestamp(end, timezone.utc),
+        entity_ids,
+        significant_changes_only=False,
+        include_start_time_state=False,
+        minimal_response=True,
+        no_attributes=True,
+        compressed_state_format=True,
+    )
+
+    rows = {}
+    for entity_id, entity_states in states.items():
+        samples = []
+        for st in entity_states:
+            if isinstance(st, dict):
+                state, t = st.get("s"), st.get("lu")
+            else:
+                state, t = st.state, st.last_updated.timestamp()
+            try:
+                x = float(state)
+            except (TypeError, ValueError):
+                continue
+            samples.append((float(t), x))
+        rows[entity_id] = samples
+    return rows
+
+
+class RecorderBackfill:
+    """Warm up new filters from recorder history, one query per window.
+
+    Sensors without restore data register on add. After BACKFILL_DELAY
+    they are served by one executor query per distinct deadband_tau_sigma
+    window (usually one per pattern), so a single long window never
+    widens the query of the other sources. Each sensor replays its window
+    through the core and the injector dt statistics. Live samples that
+    arrive meanwhile are kept by the sensor (_backfill_live) and replayed
+    on top of the history.
+    """
+
+    def __init__(self, hass: HomeAssistant, clock) -> None:
+        self.hass = hass
+        self.clock = clock
+
+        self._pending: dict = {}
+        self._handle = None
+        self._stopped = False
+
+    # ------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------
+    @callback
+    def add(self, sensor) -> None:
+        if self._stopped or "recorder" not in self.hass.config.components:
+            return
+
+        sensor._backfill_live = []
+        self._pending[sensor] = None
+        if self._handle is None:
+            self._handle = self.hass.loop.call_later(BACKFILL_DELAY, self._start)
+
+    @callback
+    def discard(self, sensor) -> None:
+        self._pending.pop(sensor, None)
+        sensor._backfill_live = None
+
+    @callback
+    def stop(self) -> None:
+        self._stopped = True
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for sensor in self._pending:
+            sensor._backfill_live = None
+        self._pending.clear()
+
+    # ------------------------------------------------------------
+    # Batched recorder query
+    # ------------------------------------------------------------
+    @callback
+    def _start(self) -> None:
+        self._handle = None
+        batch = self._pending
+        self._pending = {}
+
+        if batch:
+            self.hass.async_create_background_task(
+                self._async_run(batch),
+                "lowpass_dt recorder backfill",
+            )
+
+    async def _async_run(self, batch) -> None:
+        from homeassistant.components.recorder import get_instance
+
+        end = self.clock()
+
+        # sources grouped by history window
+        windows: dict = {}
+        for sensor in batch:
+            windows.setdefault(sensor.cfg.deadband_tau_sigma, set()).add(sensor.cfg.source)
+
+        rows = {}
+        for window, sources in windows.items():
+            entity_ids = sorted(sources)
+            try:
+                rows[window] = await get_instance(self.hass).async_add_executor_job(
+                    _fetch_history, self.hass, entity_ids, end - window, end
+                )
+            except Exception as err:  # recorder unavailable / schema error
+                _LOGGER.warning("recorder backfill failed for %d sources: %s", len(entity_ids), err)
+                rows[window] = {}
+
+            if self._stopped:
+                return
+
+        for sensor in batch:
+            live = sensor._backfill_live
+            sensor._backfill_live = None
+
+            # removed meanwhile (or entry unloaded)
+            if live is None or self._stopped:
+                continue
+
+            first_live = live[0][0] if live else end
+            history = [
+                (t, x)
+                for t, x in rows[sensor.cfg.deadband_tau_sigma].get(sensor.cfg.source, ())
+                if t < first_live
+            ]
+            if history:
+                sensor._apply_backfill(history + live)
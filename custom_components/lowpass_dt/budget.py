@@ -0,0 +1,115 @@
+import heapq
+import itertools
+import math
+import time
+
+# lower bound of a drain delay: a shorter delay may not move a large
+# clock value at all, and the drain would then reschedule itself forever
+MIN_DRAIN_DELAY = 1e-3
+
+
+def _write_now(entity):
+    entity.async_write_ha_state()
+
+
+class WriteBudget:
+    """Token-bucket limit on state writes for a whole config entry.
+
+    Writes are served immediately while tokens are available. Beyond the
+    burst, pending writes are queued and served by priority (largest
+    |err| / deadband first). A sensor is queued at most once: the entity
+    already holds its latest value, so superseded publishes coalesce into
+    a single write.
+    """
+
+    def __init__(self, loop, rate, burst, *, clock=time.monotonic, write=None):
+        self.loop = loop
+        self.clock = clock
+        self._write = write if write is not None else _write_now
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+
+        self.tokens = self.burst
+        self._t_refill = clock()
+
+        # entity -> current priority, heap holds (-priority, seq, entity)
+        self._pending = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._handle = None
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+    def submit(self, entity, priority):
+        """Write entity state now if the budget allows, else queue it."""
+
+        if entity in self._pending:
+            # coalesce: keep one pending write with the highest priority
+            if priority > self._pending[entity]:
+                self._pending[entity] = priority
+                heapq.heappush(self._heap, (-priority, next(self._seq), entity))
+            return
+
+        self._refill()
+
+        if not self._pending and self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self._write(entity)
+            return
+
+        self._pending[entity] = priority
+        heapq.heappush(self._heap, (-priority, next(self._seq), entity))
+        self._schedule_drain()
+
+    def discard(self, entity):
+        """Forget a pending write (entity removed)."""
+        self._pending.pop(entity, None)
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pending.clear()
+        self._heap.clear()
+
+    # ------------------------------------------------------------
+    # Token bucket
+    # ------------------------------------------------------------
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._t_refill) * self.rate)
+        self._t_refill = now
+
+    def _schedule_drain(self):
+        if self._handle is not None or not self._pending:
+            return
+
+        missing = max(0.0, 1.0 - self.tokens)
+        delay = missing / self.rate if self.rate > 0 else math.inf
+        if math.isinf(delay):
+            return
+        delay = max(delay, MIN_DRAIN_DELAY)
+
+        self._handle = self.loop.call_later(delay, self._drain)
+
+    def _drain(self):
+        self._handle = None
+        self._refill()
+
+        while self.tokens >= 1.0 and self._heap:
+            neg_priority, _, entity = heapq.heappop(self._heap)
+
+            # stale heap entry (re-prioritized or discarded)
+            if self._pending.get(entity) != -neg_priority:
+                continue
+
+            del self._pending[entity]
+            self.tokens -= 1.0
+            self._write(entity)
+
+        self._schedule_drain()
@@ -0,0 +1,60 @@
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WriteCoalescer:
+    """Batch state writes of one config entry into one flush per loop tick.
+
+    Publishers only mark their entity dirty. The first mark of a tick
+    schedules a single call_soon flush, which writes every dirty entity
+    exactly once with its latest state, however many publishes (or name
+    updates) happened in between.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+
+        # insertion-ordered set of dirty entities
+        self._dirty = {}
+        self._handle = None
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+    def mark(self, entity):
+        """Request a state write of entity at the end of this tick."""
+        self._dirty[entity] = None
+
+        if self._handle is None:
+            self._handle = self.loop.call_soon(self._flush)
+
+    def discard(self, entity):
+        """Forget a pending write (entity removed)."""
+        self._dirty.pop(entity, None)
+
+    @property
+    def pending(self):
+        return len(self._dirty)
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._dirty.clear()
+
+    # ------------------------------------------------------------
+    # Flush
+    # ------------------------------------------------------------
+    def _flush(self):
+        self._handle = None
+
+        # swap first: a write may mark entities again (next tick)
+        dirty = self._dirty
+        self._dirty = {}
+
+        for entity in dirty:
+            try:
+                entity.async_write_ha_state()
+            except Exception:  # one failed write must not drop the others
+                _LOGGER.exception("state write failed for %s", entity.entity_id)
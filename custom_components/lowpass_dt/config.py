@@ -4,8 +4,10 @@ import math
 import logging
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from homeassistant.core import HomeAssistant
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
 
 from .const import (
     CONF_DEADBAND,
@@ -21,6 +23,14 @@ from .const import (
     CONF_UNIQUE_ID,
     CONF_DEBUG,
     CONF_CIRCULAR,
+    CONF_INJECTION,
+    CONF_TIMESTAMP,
+    CONF_FILTER,
+    CONF_OUTLIER,
+    CONF_OUTLIER_K,
+    CONF_OUTLIER_WINDOW,
+    CONF_RATE,
+    CONF_BURST,
     DOMAIN,
 )
 
@@ -28,6 +38,18 @@ _LOGGER = logging.getLogger(__name__)
 
 MAX_PATTERN_ENTITIES = 100
 
+INJECTION_MODES = ("periodic", "analytic")
+
+TIMESTAMP_MODES = ("processing", "state", "event")
+
+FILTER_MODES = ("lowpass", "critical", "butterworth", "kalman")
+
+OUTLIER_MODES = ("off", "reject", "clamp")
+
+DISCOVERY_MODES = ("state", "registry")
+
+DIAGNOSTICS_MODES = ("entry", "sensor", "off")
+
 
 # ------------------------------------------------------------
 # Small numeric helper (NO behavior change)
@@ -39,7 +61,7 @@ def _float_or_default(value, default):
         return default
 
 
-@dataclass
+@dataclass(slots=True)
 class LowpassCfg:
     source: str
     tau: float
@@ -60,6 +82,16 @@ class LowpassCfg:
     unique_id: str | None
     debug: bool
 
+    injection: str
+
+    timestamp: str
+
+    filter: str
+
+    outlier: str
+    outlier_k: float
+    outlier_window: int
+
 
 @dataclass(frozen=True, slots=True)
 class CfgMeta:
@@ -190,6 +222,52 @@ def build_cfg(item: dict, *, source: str, allow_unique_id: bool = False) -> Lowp
         _LOGGER.warning("Ignoring name=%r for pattern-based sensor %r, use explicit sensor config", name, source)
         name = None
 
+    # injection mode
+    injection = item.get(CONF_INJECTION, "periodic")
+    if injection not in INJECTION_MODES:
+        _LOGGER.warning("Invalid injection=%r, must be one of %s, using default 'periodic'", injection, INJECTION_MODES)
+        injection = "periodic"
+
+    # filter engine
+    filter_mode = item.get(CONF_FILTER, "lowpass")
+    if filter_mode not in FILTER_MODES:
+        _LOGGER.warning("Invalid filter=%r, must be one of %s, using default 'lowpass'", filter_mode, FILTER_MODES)
+        filter_mode = "lowpass"
+
+    # analytic injection solves the first-order response only
+    if filter_mode != "lowpass" and injection == "analytic":
+        _LOGGER.warning("injection='analytic' requires filter='lowpass', using 'periodic' for source=%r", source)
+        injection = "periodic"
+
+    # outlier pre-filter (Hampel)
+    outlier = item.get(CONF_OUTLIER, "off")
+    if outlier not in OUTLIER_MODES:
+        _LOGGER.warning("Invalid outlier=%r, must be one of %s, using default 'off'", outlier, OUTLIER_MODES)
+        outlier = "off"
+
+    if outlier != "off" and circular is not None:
+        _LOGGER.warning("outlier=%r is not supported with circular mode, disabled for source=%r", outlier, source)
+        outlier = "off"
+
+    outlier_k = _float_or_default(item.get(CONF_OUTLIER_K, 4.0), 4.0)
+    if outlier_k <= 0:
+        _LOGGER.warning("Invalid outlier_k=%r, must be > 0, using default 4.0", item.get(CONF_OUTLIER_K))
+        outlier_k = 4.0
+
+    try:
+        outlier_window = int(item.get(CONF_OUTLIER_WINDOW, 15))
+    except (TypeError, ValueError):
+        outlier_window = 0
+    if not 3 <= outlier_window <= 101:
+        _LOGGER.warning("Invalid outlier_window=%r, must be 3..101, using default 15", item.get(CONF_OUTLIER_WINDOW))
+        outlier_window = 15
+
+    # source sample time
+    timestamp = item.get(CONF_TIMESTAMP, "processing")
+    if timestamp not in TIMESTAMP_MODES:
+        _LOGGER.warning("Invalid timestamp=%r, must be one of %s, using default 'processing'", timestamp, TIMESTAMP_MODES)
+        timestamp = "processing"
+
     # debug mode
     raw_debug = item.get(CONF_DEBUG, False)
     if isinstance(raw_debug, bool):
@@ -213,9 +291,72 @@ def build_cfg(item: dict, *, source: str, allow_unique_id: bool = False) -> Lowp
         suffix=suffix,
         unique_id=unique_id,
         debug=debug,
+        injection=injection,
+        timestamp=timestamp,
+        filter=filter_mode,
+        outlier=outlier,
+        outlier_k=outlier_k,
+        outlier_window=outlier_window,
     )
 
 
+# ------------------------------------------------------------
+# Fallbacks once the source state_class is known
+# ------------------------------------------------------------
+def apply_state_class(cfg: LowpassCfg, state_class: str | None, entity_id: str) -> bool:
+    """Drop settings that do not fit state_class; True if cfg changed."""
+
+    if state_class != "total_increasing":
+        return False
+
+    changed = False
+
+    if cfg.circular is not None:
+        _LOGGER.warning(
+            "Sensor %s configured as circular (period=%s) but state_class=total_increasing. Disabling circular mode.",
+            entity_id,
+            cfg.circular,
+        )
+        cfg.circular = None
+        changed = True
+
+    if cfg.filter == "butterworth":
+        _LOGGER.warning(
+            "Sensor %s uses filter=butterworth (overshoots on steps) but state_class=total_increasing. Using critical.",
+            entity_id,
+        )
+        cfg.filter = "critical"
+        changed = True
+
+    return changed
+
+
+# ------------------------------------------------------------
+# Parse entry-wide write budget (None = unlimited)
+# ------------------------------------------------------------
+def build_write_budget(raw) -> tuple[float, float] | None:
+    """Parse write_budget: {rate, burst} into (rate, burst)."""
+
+    if raw is None:
+        return None
+
+    if not isinstance(raw, dict):
+        _LOGGER.warning("Invalid write_budget=%r, expected a mapping with rate/burst, budget disabled", raw)
+        return None
+
+    rate = _float_or_default(raw.get(CONF_RATE), None)
+    if rate is None or rate <= 0:
+        _LOGGER.warning("Invalid write_budget rate=%r, must be > 0, budget disabled", raw.get(CONF_RATE))
+        return None
+
+    burst = _float_or_default(raw.get(CONF_BURST, max(1.0, 10.0 * rate)), None)
+    if burst is None or burst < 1:
+        _LOGGER.warning("Invalid write_budget burst=%r, must be >= 1, using %.0f", raw.get(CONF_BURST), max(1.0, 10.0 * rate))
+        burst = max(1.0, 10.0 * rate)
+
+    return rate, burst
+
+
 # ------------------------------------------------------------
 # Name + slug computation (single source of truth)
 # ------------------------------------------------------------
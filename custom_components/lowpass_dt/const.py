@@ -4,6 +4,12 @@ CONF_SENSORS = "sensors"                          # list of explicit sensor conf
 CONF_SOURCE = "source"                            # source entity_id for filtering
 CONF_PATTERNS = "patterns"                        # list of pattern-based configs
 CONF_MATCH = "match"                              # fnmatch pattern for auto-matching sensors
+CONF_DISCOVERY = "discovery"                      # dynamic pattern discovery: state / registry
+CONF_WRITE_BUDGET = "write_budget"                # entry-wide state write budget (rate, burst)
+CONF_RATE = "rate"                                # write budget: writes per second
+CONF_BURST = "burst"                              # write budget: bucket size
+CONF_BACKFILL = "backfill"                        # warm up new filters from recorder history
+CONF_DIAGNOSTICS = "diagnostics"                  # write-reduction sensors: entry / sensor / off
 
 CONF_NAME = "name"                                # explicit friendly name override
 CONF_PREFIX = "prefix"                            # prefix for generated entity_id
@@ -22,4 +28,11 @@ CONF_DEADBAND_K_SIGMA = "deadband_k_sigma"        # adaptive deadband multiplier
 CONF_MIN_RATE_DT = "min_rate_dt"                  # max interval between outputs (seconds)
 CONF_MAX_RATE_DT = "max_rate_dt"                  # min interval between outputs (rate limiter)
 
+CONF_INJECTION = "injection"                      # silence injection mode: periodic / analytic
+CONF_FILTER = "filter"                            # filter engine: lowpass / critical / butterworth / kalman
+CONF_OUTLIER = "outlier"                          # outlier pre-filter: off / reject / clamp
+CONF_OUTLIER_K = "outlier_k"                      # outlier threshold in MAD-sigmas
+CONF_OUTLIER_WINDOW = "outlier_window"            # outlier window (samples)
+CONF_TIMESTAMP = "timestamp"                      # source sample time: processing / state / event
+
 CONF_DEBUG = "debug"                              # autorise debut verbosity in attributes and log
\ No newline at end of file
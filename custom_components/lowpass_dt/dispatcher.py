@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import logging
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SourceDispatcher:
+    """Fan out source state changes to the filtered sensors of one entry.
+
+    A single state_changed listener is registered for the whole entry; its
+    event filter is one dict lookup, so adding or removing a sensor never
+    touches the bus subscription.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._sensors: dict[str, list] = {}
+        self._unsub = None
+
+    # ------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------
+    @callback
+    def add(self, sensor) -> None:
+        self._sensors.setdefault(sensor.cfg.source, []).append(sensor)
+
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._dispatch,
+                event_filter=self._filter,
+            )
+
+    @callback
+    def remove(self, sensor) -> None:
+        sensors = self._sensors.get(sensor.cfg.source)
+        if not sensors or sensor not in sensors:
+            return
+
+        sensors.remove(sensor)
+        if not sensors:
+            del self._sensors[sensor.cfg.source]
+
+    @callback
+    def stop(self) -> None:
+        self._sensors.clear()
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    # ------------------------------------------------------------
+    # Bus callbacks
+    # ------------------------------------------------------------
+    @callback
+    def _filter(self, event_data) -> bool:
+        return event_data["entity_id"] in self._sensors
+
+    @callback
+    def _dispatch(self, event: Event) -> None:
+        # copy: a handler may remove itself
+        for sensor in tuple(self._sensors.get(event.data["entity_id"], ())):
+            try:
+                sensor._handle_source_event(event)
+            except Exception:  # one broken sensor must not starve the others
+                _LOGGER.exception("source event failed for %s", sensor.entity_id)
@@ -1,18 +1,404 @@
+import functools
 import logging
 import math
 
 _LOGGER = logging.getLogger(__name__)
 
+# Kalman engine: process noise adapts over this many mean source intervals
+KALMAN_SAMPLES = 20
+
+
+# ------------------------------------------------------------
+# Compiled parameter block (immutable, rebuilt on cfg change)
+# ------------------------------------------------------------
+class CoreParams:
+    """Per-config constants of the hot path, converted once.
+
+    Blocks are shared between all cores with the same filter settings
+    (see compile_params), so they must never hold per-sensor data.
+    """
+
+    __slots__ = (
+        "tau",
+        "tau_i",
+        "tau_s_min",
+        "tau_s_max",
+        "circular",
+        "half",
+        "deadband",
+        "k_sigma",
+        "deadband_tau_sigma",
+        "min_rate_dt",
+        "max_rate_dt",
+        "periodic",
+        "engine",
+        "w",
+        "zeta",
+        "decay",
+        "wd",
+        "update",
+        "lowpass",
+    )
+
+    def __init__(self, tau, circular, deadband, k_sigma, tau_sigma, min_rate_dt, max_rate_dt, engine="lowpass"):
+        tau_lp = max(0.0, tau)
+        if tau_lp <= 0:
+            engine = "lowpass"
+
+        # second-order engines: natural frequency and damping scaled so
+        # that the DC lag (group delay) equals tau, like the EMA
+        w = zeta = None
+        if engine == "critical":
+            w, zeta = 2.0 / tau_lp, 1.0
+        elif engine == "butterworth":
+            w, zeta = math.sqrt(2.0) / tau_lp, math.sqrt(0.5)
+
+        if engine == "kalman":
+            update = _update_kalman_linear if circular is None else _update_kalman_circular
+            lowpass = _lowpass_kalman_linear if circular is None else _lowpass_kalman_circular
+        elif w is None:
+            update = _update_linear if circular is None else _update_circular
+            lowpass = _lowpass_linear if circular is None else _lowpass_circular
+        else:
+            update = _update2_linear if circular is None else _update2_circular
+            lowpass = _lowpass2_linear if circular is None else _lowpass2_circular
+
+        values = {
+            "tau": tau_lp,
+            "tau_i": max(1.0, tau),
+            "tau_s_min": 10.0 * tau_lp,
+            "tau_s_max": max(0.0, tau_sigma),
+            "circular": circular,
+            "half": circular / 2 if circular is not None else None,
+            "deadband": deadband,
+            "k_sigma": k_sigma,
+            "deadband_tau_sigma": tau_sigma,
+            "min_rate_dt": min_rate_dt,
+            "max_rate_dt": max_rate_dt,
+            "periodic": min_rate_dt > max_rate_dt,
+            "engine": engine,
+            "w": w,
+            "zeta": zeta,
+            "decay": zeta * w if w is not None else None,
+            "wd": w * math.sqrt(1.0 - zeta * zeta) if w is not None else None,
+            # specialized step functions (no per-event engine / circular branch)
+            "update": update,
+            "lowpass": lowpass,
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CoreParams is immutable, rebuild it from the cfg")
+
+
+@functools.lru_cache(maxsize=256)
+def _shared_params(*key):
+    return CoreParams(*key)
+
+
+def compile_params(cfg):
+    """Return the (shared) CoreParams block of cfg."""
+    return _shared_params(
+        float(cfg.tau),
+        float(cfg.circular) if cfg.circular is not None else None,
+        float(cfg.deadband) if cfg.deadband is not None else None,
+        float(cfg.deadband_k_sigma),
+        float(cfg.deadband_tau_sigma),
+        float(cfg.min_rate_dt),
+        float(cfg.max_rate_dt),
+        cfg.filter,
+    )
+
+
+def _clamped_dt(p, t_prev, now):
+    if t_prev is None:
+        return 0.0
+    dt = now - t_prev
+    if dt < 0.0:
+        return 0.0
+    return dt if dt < p.tau else p.tau
+
+
+def _sigma_beta(core, p, dt, now):
+    """EMA weight of one sample over the sigma horizon."""
+    if core.t_sigma_start is None:
+        # just started (no restore context)
+        tau_s = p.tau_s_min
+    else:
+        elapsed = max(0.0, now - core.t_sigma_start)
+        tau_s = min(p.tau_s_max, max(p.tau_s_min, elapsed))
+
+    return (dt / (tau_s + dt)) if (tau_s + dt) > 0 else 0.1
+
+
+def _update_sigma(core, p, y, dt, now):
+    """EMA of the filtered signal (mean, second moment, sigma)."""
+    beta = _sigma_beta(core, p, dt, now)
+
+    mean = core.src_mean
+    m2 = core.src_m2
+    if mean is None or m2 is None:
+        core.src_mean = y
+        core.src_m2 = y * y
+        core.src_var = 0.0
+    else:
+        mean = (1 - beta) * mean + beta * y
+        m2 = (1 - beta) * m2 + beta * (y * y)
+        core.src_mean = mean
+        core.src_m2 = m2
+        core.src_var = max(m2 - mean * mean, 0.0)
+
+    core.src_sigma = math.sqrt(core.src_var)
+
+
+def _lowpass_linear(core, p, x, now):
+    dt = _clamped_dt(p, core.t_prev, now)
+    s = p.tau + dt
+    alpha = (dt / s) if s > 0 else 1.0
+
+    y = core.y
+    core.y = y + alpha * (x - y)
+    core.t_prev = now
+    return dt
+
+
+def _lowpass_circular(core, p, x, now):
+    dt = _clamped_dt(p, core.t_prev, now)
+    s = p.tau + dt
+    alpha = (dt / s) if s > 0 else 1.0
+
+    y = core.y
+    c = p.circular
+    half = p.half
+    core.y = (y + alpha * (((x - y + half) % c) - half)) % c
+    core.t_prev = now
+    return dt
+
+
+def _update_linear(core, p, x, now):
+    dt = _lowpass_linear(core, p, x, now)
+    _update_sigma(core, p, core.y, dt, now)
+    return dt
+
+
+def _update_sigma_circular(core, p, dt, now):
+    # unwrap y around the running mean before averaging
+    y = core.y
+    mean = core.src_mean
+    if mean is not None:
+        y = mean + ((y - mean + p.half) % p.circular) - p.half
+
+    _update_sigma(core, p, y, dt, now)
+
+
+def _update_circular(core, p, x, now):
+    dt = _lowpass_circular(core, p, x, now)
+    _update_sigma_circular(core, p, dt, now)
+    return dt
+
+
+# ------------------------------------------------------------
+# Second-order engines (critically damped, Butterworth)
+# ------------------------------------------------------------
+def _response2(p, e0, v0, dt):
+    """Exact step of e'' + 2 zeta w e' + w^2 e = 0 over dt, e = y - x.
+
+    The input x is held over the step, so any dt composes exactly.
+    Returns (e, v) with v = dy/dt.
+    """
+    k = math.exp(-p.decay * dt)
+
+    if p.zeta >= 1.0:
+        c = (v0 + p.w * e0) * dt
+        return k * (e0 + c), k * (v0 - p.w * c)
+
+    wd = p.wd
+    cs = math.cos(wd * dt)
+    sn = math.sin(wd * dt) / wd
+    return (
+        k * (e0 * cs + (v0 + p.decay * e0) * sn),
+        k * (v0 * cs - (p.w * p.w * e0 + p.decay * v0) * sn),
+    )
+
+
+def _lowpass2_linear(core, p, x, now):
+    dt = _clamped_dt(p, core.t_prev, now)
+
+    e, core.v = _response2(p, core.y - x, core.v, dt)
+    core.y = x + e
+    core.t_prev = now
+    return dt
+
+
+def _lowpass2_circular(core, p, x, now):
+    dt = _clamped_dt(p, core.t_prev, now)
+
+    e0 = ((core.y - x + p.half) % p.circular) - p.half
+    e, core.v = _response2(p, e0, core.v, dt)
+    core.y = (x + e) % p.circular
+    core.t_prev = now
+    return dt
+
+
+def _update2_linear(core, p, x, now):
+    dt = _lowpass2_linear(core, p, x, now)
+    _update_sigma(core, p, core.y, dt, now)
+    return dt
+
+
+def _update2_circular(core, p, x, now):
+    dt = _lowpass2_circular(core, p, x, now)
+    _update_sigma_circular(core, p, dt, now)
+    return dt
+
+
+# ------------------------------------------------------------
+# Scalar Kalman engine (local level, adaptive noises)
+# ------------------------------------------------------------
+def _kalman_noise(core, p, x, now):
+    """Measurement noise R from the detrended residual of real samples.
+
+    The middle of the last three samples is compared with the linear
+    interpolation of its neighbours (irregular dt, removes any trend);
+    for white noise the squared residual is R * (1 + w^2 + (1 - w)^2).
+    Averaged over the sigma horizon.
+    """
+    t0 = core.kt0
+    t1 = core.kt1
+    if t0 is not None and now > t0:
+        w = (t1 - t0) / (now - t0)
+        a = core.kx1 - core.kx0
+        b = x - core.kx0
+        if p.circular is not None:
+            a = ((a + p.half) % p.circular) - p.half
+            b = ((b + p.half) % p.circular) - p.half
+        d = a - w * b
+        r_obs = d * d / (1.0 + w * w + (1.0 - w) * (1.0 - w))
+
+        if core.kr <= 0.0:
+            core.kr = r_obs
+        else:
+            core.kr += _sigma_beta(core, p, now - t1, now) * (r_obs - core.kr)
+
+    if t1 is None or now > t1:
+        core.kx0, core.kt0 = core.kx1, t1
+        core.kx1, core.kt1 = x, now
+
+
+def _kalman_step(core, innov, dt, adapt):
+    """Predict over dt, correct with innov = x - y; return the correction.
+
+    Process noise grows as q * dt (irregular dt, no clamping). On real
+    samples q follows the innovation excess (innov^2 - P - R) / dt over
+    KALMAN_SAMPLES mean source intervals (injector dt statistics).
+    """
+    r = core.kr
+    p0 = core.kp
+    p_pred = p0 + core.kq * dt
+    s = p_pred + r
+    k = (p_pred / s) if s > 0 else 1.0
+    core.kp = (1.0 - k) * p_pred
+
+    if adapt and dt > 0:
+        stats = core.dt_stats
+        dt_mean = stats.dt_mean if stats is not None and stats.dt_mean else dt
+        beta = dt / (dt + KALMAN_SAMPLES * dt_mean)
+        q_obs = (innov * innov - p0 - r) / dt
+        core.kq = max(0.0, core.kq + beta * (q_obs - core.kq))
+
+    return k * innov
+
+
+def _kalman_linear(core, p, x, now, adapt):
+    t_prev = core.t_prev
+    dt = max(0.0, now - t_prev) if t_prev is not None else 0.0
+
+    core.y += _kalman_step(core, x - core.y, dt, adapt)
+    core.t_prev = now
+    return dt
+
+
+def _kalman_circular(core, p, x, now, adapt):
+    t_prev = core.t_prev
+    dt = max(0.0, now - t_prev) if t_prev is not None else 0.0
+
+    innov = ((x - core.y + p.half) % p.circular) - p.half
+    core.y = (core.y + _kalman_step(core, innov, dt, adapt)) % p.circular
+    core.t_prev = now
+    return dt
+
+
+def _lowpass_kalman_linear(core, p, x, now):
+    # synthetic sample: converge, but do not learn from it
+    return _kalman_linear(core, p, x, now, False)
+
+
+def _lowpass_kalman_circular(core, p, x, now):
+    return _kalman_circular(core, p, x, now, False)
+
+
+def _update_kalman_linear(core, p, x, now):
+    _kalman_noise(core, p, x, now)
+    dt = _kalman_linear(core, p, x, now, True)
+    _update_sigma(core, p, core.y, dt, now)
+    return dt
+
+
+def _update_kalman_circular(core, p, x, now):
+    _kalman_noise(core, p, x, now)
+    dt = _kalman_circular(core, p, x, now, True)
+    _update_sigma_circular(core, p, dt, now)
+    return dt
+
 
 class LowpassCore:
-    """Pure math core: low-pass, adaptive sigma, deadband, rounding."""
+    """Pure math core: low-pass engine, adaptive sigma, deadband, rounding."""
+
+    __slots__ = (
+        "_cfg",
+        "_p",
+        "y",
+        "t_prev",
+        "v",
+        "kp",
+        "kq",
+        "kr",
+        "kx0",
+        "kt0",
+        "kx1",
+        "kt1",
+        "dt_stats",
+        "src_mean",
+        "src_var",
+        "src_sigma",
+        "src_m2",
+        "last_published",
+        "time_last_pub",
+        "err",
+        "err_i",
+        "t_sigma_start",
+        "n_deadband",
+        "n_rate_blocked",
+    )
 
     def __init__(self, cfg):
         self.cfg = cfg
 
-        # filter state
+        # filter state (v = dy/dt, second-order engines only)
         self.y = None
         self.t_prev = None
+        self.v = 0.0
+
+        # Kalman engine: error variance, process noise rate (units^2/s),
+        # measurement noise, last two real samples and the source
+        # interval statistics (TauInjector, set by it)
+        self.kp = 0.0
+        self.kq = 0.0
+        self.kr = 0.0
+        self.kx0 = self.kt0 = None
+        self.kx1 = self.kt1 = None
+        self.dt_stats = None
 
         # stats (always computed for transparency)
         self.src_mean = None
@@ -32,6 +418,45 @@ class LowpassCore:
         # sigma horizon start (None = just started / no restore)
         self.t_sigma_start = None
 
+        # write-reduction counters (publish decisions)
+        self.n_deadband = 0
+        self.n_rate_blocked = 0
+
+    # ------------------------------------------------------------
+    # Config (compiled into a CoreParams block on every change)
+    # ------------------------------------------------------------
+    @property
+    def cfg(self):
+        return self._cfg
+
+    @cfg.setter
+    def cfg(self, cfg):
+        self.set_cfg(cfg)
+
+    def set_cfg(self, cfg):
+        """Compile cfg (call again after mutating it in place)."""
+        self._cfg = cfg
+        self._p = compile_params(cfg)
+
+    # ------------------------------------------------------------
+    # Forget the filter state (next source sample starts over)
+    # ------------------------------------------------------------
+    def reset_filter(self):
+        """Drop engine and signal statistics state; publish state is kept."""
+        self.y = None
+        self.t_prev = None
+        self.v = 0.0
+
+        self.kp = self.kq = self.kr = 0.0
+        self.kx0 = self.kt0 = None
+        self.kx1 = self.kt1 = None
+
+        self.src_mean = None
+        self.src_var = None
+        self.src_sigma = None
+        self.src_m2 = None
+        self.t_sigma_start = None
+
     # ------------------------------------------------------------
     # Update filter from real source value
     # ------------------------------------------------------------
@@ -40,6 +465,8 @@ class LowpassCore:
         if self.y is None:
             self.y = x
             self.t_prev = now
+            self.v = 0.0
+            self.kp = 0.0
             self.t_sigma_start = now
 
             # Always initialize stats
@@ -50,61 +477,8 @@ class LowpassCore:
 
             return 0.0
 
-        # -------------------------
-        # low-pass
-        # -------------------------
-        tau = max(0.0, float(self.cfg.tau))
-        t_prev = self.t_prev if self.t_prev is not None else now
-        dt = min(max(0.0, now - t_prev), tau)
-        alpha = (dt / (tau + dt)) if (tau + dt) > 0 else 1.0
-
-        if self.cfg.circular is None:
-            self.y = self.y + alpha * (x - self.y)
-        else:
-            self.y = (
-                self.y
-                + alpha * (((x - self.y + self.cfg.circular / 2) % self.cfg.circular) - self.cfg.circular / 2)
-            ) % self.cfg.circular
-
-        self.t_prev = now
-
-        # -------------------------
-        # EMA of filtered signal
-        # -------------------------
-
-        tau_lp = max(0.0, float(self.cfg.tau))
-        tau_s_min = 10.0 * tau_lp
-        tau_s_max = max(0.0, float(self.cfg.deadband_tau_sigma))
-
-        if self.t_sigma_start is None:
-            # just started (no restore context)
-            tau_s_dynamic = tau_s_min
-        else:
-            elapsed = max(0.0, now - self.t_sigma_start)
-            tau_s_dynamic = min(tau_s_max, max(tau_s_min, elapsed))
-
-        beta = (dt / (tau_s_dynamic + dt)) if (tau_s_dynamic + dt) > 0 else 0.1
-
-        if self.cfg.circular is None or self.src_mean is None:
-            y = self.y
-        else:
-            y = self.src_mean + (
-                (self.y - self.src_mean + self.cfg.circular / 2)
-                % self.cfg.circular
-            ) - self.cfg.circular / 2
-
-        if self.src_mean is None or self.src_m2 is None:
-            self.src_mean = y
-            self.src_m2 = y * y
-            self.src_var = 0.0
-        else:
-            self.src_mean = (1 - beta) * self.src_mean + beta * y
-            self.src_m2 = (1 - beta) * self.src_m2 + beta * (y * y)
-            self.src_var = max(self.src_m2 - self.src_mean * self.src_mean, 0.0)
-
-        self.src_sigma = math.sqrt(self.src_var)
-
-        return dt
+        p = self._p
+        return p.update(self, p, x, now)
 
     # ------------------------------------------------------------
     # Update filter using synthetic (injected) source value
@@ -114,38 +488,136 @@ class LowpassCore:
         if self.y is None:
             return 0.0
 
-        # low-pass
-        tau = max(0.0, float(self.cfg.tau))
+        p = self._p
+        return p.lowpass(self, p, last_source_value, now)
+
+    # ------------------------------------------------------------
+    # Exact synthetic update (analytic injection)
+    # ------------------------------------------------------------
+    def update_synthetic_exact(self, last_source_value, now):
+        """Continuous-time first-order response to a constant input.
+
+        y(t) = x + (y0 - x) * exp(-dt / tau), no dt clamping: successive
+        calls compose exactly whatever the spacing between them.
+        """
+        if self.y is None:
+            return 0.0
+
+        p = self._p
+        tau = p.tau
         t_prev = self.t_prev if self.t_prev is not None else now
-        dt = min(max(0.0, now - t_prev), tau)
-        alpha = (dt / (tau + dt)) if (tau + dt) > 0 else 1.0
+        dt = max(0.0, now - t_prev)
+        alpha = (1.0 - math.exp(-dt / tau)) if tau > 0 else 1.0
 
-        if self.cfg.circular is None:
+        if p.circular is None:
             self.y = self.y + alpha * (last_source_value - self.y)
         else:
             self.y = (
                 self.y
-                + alpha * (((last_source_value - self.y + self.cfg.circular / 2) % self.cfg.circular) - self.cfg.circular / 2)
-            ) % self.cfg.circular
+                + alpha * (((last_source_value - self.y + p.half) % p.circular) - p.half)
+            ) % p.circular
 
         self.t_prev = now
 
         return dt
 
+    # ------------------------------------------------------------
+    # Next publish-relevant time while the source is silent
+    # ------------------------------------------------------------
+    def next_silence_event(self, last_source_value, now):
+        """Return the time of the next publish (or final convergence).
+
+        The target is constant during silence, so the exact response is
+        known: y(s) = x + (y0 - x) * exp(-s / tau). Solve for the first
+        deadband crossing, integral crossing, min_rate_dt publish and the
+        final convergence |y - x| < deadband.
+        """
+        if self.y is None:
+            return None
+
+        p = self._p
+        tau = p.tau
+        t0 = self.t_prev if self.t_prev is not None else now
+        deadband_eff = self.effective_deadband()
+
+        def wrap(v):
+            if p.circular is None:
+                return v
+            return ((v + p.half) % p.circular) - p.half
+
+        # distance to target
+        d0 = wrap(self.y - last_source_value)
+        if abs(d0) < deadband_eff or tau <= 0:
+            return now
+
+        # final convergence (not subject to max_rate_dt)
+        t_conv = t0 + tau * math.log(abs(d0) / deadband_eff)
+
+        if self.time_last_pub is None or self.last_published is None:
+            return now
+
+        candidates = []
+
+        # periodic publish
+        if p.periodic:
+            candidates.append(self.time_last_pub + p.min_rate_dt)
+
+        # deadband crossing: err(s) = e0 - d0 * (1 - exp(-s / tau))
+        e0 = wrap(self.y - self.last_published)
+        e_inf = e0 - d0
+        if abs(e0) >= deadband_eff:
+            candidates.append(t0)
+        else:
+            target = deadband_eff if e_inf > e0 else -deadband_eff
+            if abs(e_inf) > deadband_eff and (e_inf > 0) == (target > 0):
+                frac = (e0 - target) / d0
+                candidates.append(t0 - tau * math.log(1.0 - frac))
+
+        # integral crossing: |err(s)| * (t0 + s - t_pub) / tau_i >= deadband
+        tau_i = p.tau_i
+
+        def integral(s):
+            err = e0 - d0 * (1.0 - math.exp(-s / tau))
+            return abs(err) * (t0 + s - self.time_last_pub) / tau_i
+
+        s_hi = max(min(candidates + [t_conv]) - t0, 0.0)
+        if integral(s_hi) >= deadband_eff:
+            s_lo = 0.0
+            for _ in range(40):
+                s_mid = 0.5 * (s_lo + s_hi)
+                if integral(s_mid) >= deadband_eff:
+                    s_hi = s_mid
+                else:
+                    s_lo = s_mid
+            candidates.append(t0 + s_hi)
+
+        t_next = t_conv
+        if candidates:
+            # deadband publishes are held back by the rate limiter (strict >)
+            t_pub = max(min(candidates), self.time_last_pub + p.max_rate_dt + 1e-3)
+            t_next = min(t_next, t_pub)
+
+        return max(t_next, now)
+
     # ------------------------------------------------------------
     # Compute effective deadband (fixed or adaptive)
     # ------------------------------------------------------------
     def effective_deadband(self):
-        if self.cfg.deadband is not None:
-            return float(self.cfg.deadband)
-        sigma = float(self.src_sigma) if self.src_sigma is not None else 0.0
-        return max(0.001, float(self.cfg.deadband_k_sigma) * sigma)
+        p = self._p
+        if p.deadband is not None:
+            return p.deadband
+        sigma = self.src_sigma if self.src_sigma is not None else 0.0
+        return max(0.001, p.k_sigma * sigma)
 
     # ------------------------------------------------------------
     # Decide if a publish should occur
     # ------------------------------------------------------------
-    def should_publish(self, now):
-        """Decide if we should publish."""
+    def should_publish(self, now, injected=False):
+        """Decide if we should publish.
+
+        The n_deadband / n_rate_blocked counters only count real source
+        samples (injected ticks are not source events).
+        """
 
         if self.y is None:
             return False
@@ -153,46 +625,50 @@ class LowpassCore:
         if self.time_last_pub is None or self.last_published is None:
             return True
 
+        p = self._p
+
         # periodic publish
-        if self.cfg.min_rate_dt > self.cfg.max_rate_dt:
-            if (now - self.time_last_pub) > self.cfg.min_rate_dt:
+        if p.periodic:
+            if (now - self.time_last_pub) > p.min_rate_dt:
                 return True
 
         # deadband + integral correction
         deadband_eff = self.effective_deadband()
 
-        if self.cfg.circular is None:
-            self.err = self.y - self.last_published
+        if p.circular is None:
+            err = self.y - self.last_published
         else:
-            self.err = (
-                (self.y - self.last_published + self.cfg.circular / 2) % self.cfg.circular
-            ) - self.cfg.circular / 2
+            err = ((self.y - self.last_published + p.half) % p.circular) - p.half
+        self.err = err
 
         dt = max(0.0, now - self.time_last_pub)
-        tau_i = max(1.0, self.cfg.tau)
-        self.err_i = (self.err * dt) / tau_i
+        self.err_i = err_i = (err * dt) / p.tau_i
 
-        if abs(self.err) >= deadband_eff or abs(self.err_i) >= deadband_eff:
+        if abs(err) >= deadband_eff or abs(err_i) >= deadband_eff:
 
-            if self.cfg.max_rate_dt > 0:
-                if (now - self.time_last_pub) > self.cfg.max_rate_dt:
+            if p.max_rate_dt > 0:
+                if (now - self.time_last_pub) > p.max_rate_dt:
                     return True
                 else:
                     if self.t_sigma_start is not None:
                         elapsed = now - self.t_sigma_start
-                        if elapsed >= self.cfg.deadband_tau_sigma:
+                        if elapsed >= p.deadband_tau_sigma:
                             _LOGGER.warning(
                                 "Publish blocked by max_rate_dt=%.1fs for %r (deadband=%.6f, err=%.6f, err_i=%.6f)",
-                                self.cfg.max_rate_dt,
-                                self.cfg.source,
+                                p.max_rate_dt,
+                                self._cfg.source,
                                 deadband_eff,
                                 self.err,
                                 self.err_i,
                             )
+                    if not injected:
+                        self.n_rate_blocked += 1
                     return False
             else:
                 return True
         else:
+            if not injected:
+                self.n_deadband += 1
             return False
 
         return True
@@ -1,26 +1,48 @@
-from homeassistant.helpers.event import async_call_later, async_track_time_interval
-from datetime import timedelta
-from homeassistant.util import dt as dt_util
 import math
 
 
 class TauInjector:
     """Adaptive tau injector with clean silence detection (no polling)."""
 
-    def __init__(self, hass, cfg, core, get_last_source, publish_callback):
+    __slots__ = (
+        "hass",
+        "cfg",
+        "core",
+        "get_last_source",
+        "publish_callback",
+        "wheel",
+        "timer_injection",
+        "injecting",
+        "timer_silence",
+        "t_last_source",
+        "dt_mean",
+        "dt_m2",
+        "dt_silence_raw",
+        "source_just_resumed",
+        "limit",
+        "interval",
+        "silent",
+    )
+
+    def __init__(self, hass, cfg, core, get_last_source, publish_callback, wheel):
         self.hass = hass
         self.cfg = cfg
         self.core = core
         self.get_last_source = get_last_source
         self.publish_callback = publish_callback
 
+        # Shared timer wheel (one per config entry)
+        self.wheel = wheel
+
         # Periodic injection timer
-        self.unsub_injection = None
+        self.timer_injection = wheel.timer(self._tick)
+        self.injecting = False
 
         # Silence one-shot timer
-        self.unsub_silence = None
+        self.timer_silence = wheel.timer(self._on_silence_detected)
 
-        # Stats
+        # Stats (also read by the Kalman engine)
+        core.dt_stats = self
         self.t_last_source = None
         self.dt_mean = None
         self.dt_m2 = None
@@ -41,13 +63,9 @@ class TauInjector:
     # ------------------------------------------------------------
     def stop(self):
         """Stop all timers (safe to call multiple times)."""
-        if self.unsub_silence is not None:
-            self.unsub_silence()
-            self.unsub_silence = None
-
-        if self.unsub_injection is not None:
-            self.unsub_injection()
-            self.unsub_injection = None
+        self.wheel.cancel(self.timer_silence)
+        self.wheel.cancel(self.timer_injection)
+        self.injecting = False
 
         self.silent = False
 
@@ -63,13 +81,9 @@ class TauInjector:
         # End of silence
         self.silent = False
 
-        # Cancel previous silence timer
-        if self.unsub_silence is not None:
-            self.unsub_silence()
-            self.unsub_silence = None
-
         # First measurement after silence: ignore dt
         if self.source_just_resumed:
+            self.wheel.cancel(self.timer_silence)
             self.t_last_source = t
             return
 
@@ -81,6 +95,13 @@ class TauInjector:
         # Schedule new silence detection
         self._schedule_silence_timer()
 
+    # ------------------------------------------------------------
+    # Historical source time (backfill): stats only, no timers
+    # ------------------------------------------------------------
+    def seed_source_time(self, t):
+        self._update_dt_stats(t)
+        self.t_last_source = t
+
     # ------------------------------------------------------------
     # Update EMA stats for dt_source (NO LOGIC CHANGE)
     # ------------------------------------------------------------
@@ -119,33 +140,36 @@ class TauInjector:
         self.interval = max(min(self.dt_mean, tau), 1.0)
 
     # ------------------------------------------------------------
-    # Schedule silence one-shot
+    # Schedule silence one-shot (re-arming replaces previous deadline)
     # ------------------------------------------------------------
     def _schedule_silence_timer(self):
-        self.unsub_silence = async_call_later(
-            self.hass,
-            self.limit,
-            self._on_silence_detected,
-        )
+        self.wheel.arm(self.timer_silence, self.limit)
 
     # ------------------------------------------------------------
     # Silence detected (one-shot)
     # ------------------------------------------------------------
     def _on_silence_detected(self, _):
-        self.unsub_silence = None
+        self.wheel.cancel(self.timer_silence)
         self.silent = True
 
-        # Immediate injection
-        self._inject_once()
+        # Closed-form mode: wake up only when a publish is due
+        if self.cfg.injection == "analytic":
+            self.injecting = True
+            self._inject_exact()
+            return
 
-        # Start periodic injection
+        # Start periodic injection (before the first publish, which may
+        # converge and stop it again)
         self._start_periodic_injection()
 
+        # Immediate injection
+        self._inject_once()
+
     # ------------------------------------------------------------
-    # Inject once (NO LOGIC CHANGE)
+    # Inject once (wheel ticks and silence timers run on the loop)
     # ------------------------------------------------------------
     def _inject_once(self):
-        now = dt_util.utcnow().timestamp()
+        now = self.wheel.clock()
         last_source_value = self.get_last_source()
 
         if last_source_value is None:
@@ -153,30 +177,50 @@ class TauInjector:
 
         dt = self.core.update_synthetic(last_source_value, now)
 
-        self.hass.loop.call_soon_threadsafe(
-            self.publish_callback,
-            last_source_value,
-            now,
-            dt,
-        )
+        self.publish_callback(last_source_value, now, dt)
+
+    # ------------------------------------------------------------
+    # Inject exact response and schedule the next due publish
+    # ------------------------------------------------------------
+    def _inject_exact(self):
+        now = self.wheel.clock()
+        last_source_value = self.get_last_source()
+
+        if last_source_value is None:
+            self.injecting = False
+            return
+
+        dt = self.core.update_synthetic_exact(last_source_value, now)
+
+        # already on the loop: publish synchronously so the next wake-up
+        # is computed from the post-publish state
+        self.publish_callback(last_source_value, now, dt)
+
+        # convergence publish stopped the injection
+        if not self.injecting:
+            return
+
+        t_next = self.core.next_silence_event(last_source_value, now)
+        if t_next is None or t_next <= now:
+            # publish refused (e.g. monotonicity): fall back to interval
+            t_next = now + self.interval
+
+        self.wheel.arm_at(self.timer_injection, t_next)
 
     # ------------------------------------------------------------
     # Start periodic injection
     # ------------------------------------------------------------
     def _start_periodic_injection(self):
-        self.unsub_injection = async_track_time_interval(
-            self.hass,
-            self._tick,
-            timedelta(seconds=self.interval),
-        )
+        self.injecting = True
+        self.wheel.arm(self.timer_injection, self.interval)
 
     # ------------------------------------------------------------
     # Stop periodic injection
     # ------------------------------------------------------------
     def _stop_injection(self):
-        if self.unsub_injection is not None:
-            self.unsub_injection()
-            self.unsub_injection = None
+        if self.injecting:
+            self.injecting = False
+            self.wheel.cancel(self.timer_injection)
             self.source_just_resumed = True
 
     # ------------------------------------------------------------
@@ -189,4 +233,15 @@ class TauInjector:
             self._stop_injection()
             return
 
-        self._inject_once()
\ No newline at end of file
+        if self.cfg.injection == "analytic":
+            self._inject_exact()
+            return
+
+        self._inject_once()
+
+        # Re-arm on the previous deadline (no drift) unless stopped meanwhile
+        if self.injecting:
+            self.wheel.arm_at(
+                self.timer_injection,
+                self.timer_injection.deadline + self.interval,
+            )
\ No newline at end of file
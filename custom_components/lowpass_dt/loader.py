@@ -1,27 +1,38 @@
 from __future__ import annotations
 
-import fnmatch
 import logging
+from collections.abc import Callable
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback, CoreState
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_state_change_event
 
 from .const import (
     CONF_SENSORS,
     CONF_SOURCE,
     CONF_PATTERNS,
     CONF_MATCH,
+    CONF_DISCOVERY,
+    CONF_WRITE_BUDGET,
+    CONF_BACKFILL,
+    CONF_DIAGNOSTICS,
     DOMAIN,
 )
 
 from .config import (
     MAX_PATTERN_ENTITIES,
+    DISCOVERY_MODES,
+    DIAGNOSTICS_MODES,
     LowpassCfg,
     CfgMeta,
     build_cfg,
+    build_write_budget,
     make_meta,
 )
+from .matcher import PatternMatcher
+from .runtime import LowpassRuntime
+from .stats import entry_stats_unique_id, stats_unique_id
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -76,6 +87,45 @@ async def async_setup_entry_loader(
     sensors_list = data.get(CONF_SENSORS, []) or []
     patterns_list = data.get(CONF_PATTERNS, []) or []
 
+    discovery = data.get(CONF_DISCOVERY, "state")
+    if discovery not in DISCOVERY_MODES:
+        _LOGGER.warning("Invalid discovery=%r, must be one of %s, using default 'state'", discovery, DISCOVERY_MODES)
+        discovery = "state"
+
+    backfill = data.get(CONF_BACKFILL, True)
+    if not isinstance(backfill, bool):
+        _LOGGER.warning("Invalid backfill=%r, must be true/false, using default True", backfill)
+        backfill = True
+
+    # opt-in: the stats sensors write to the recorder themselves
+    diagnostics = data.get(CONF_DIAGNOSTICS, "off")
+    if diagnostics not in DIAGNOSTICS_MODES:
+        _LOGGER.warning("Invalid diagnostics=%r, must be one of %s, using default 'off'", diagnostics, DIAGNOSTICS_MODES)
+        diagnostics = "off"
+
+    # ------------------------------------------------------------
+    # Shared per-entry runtime (timer wheel, ...)
+    # ------------------------------------------------------------
+    runtime = LowpassRuntime(
+        hass,
+        write_budget=build_write_budget(data.get(CONF_WRITE_BUDGET)),
+        backfill=backfill,
+        diagnostics=diagnostics,
+        entry_id=entry.entry_id,
+    )
+    entry.async_on_unload(runtime.stop)
+
+    # awaited by async_unload_entry (final filter state save)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = runtime
+
+    # single read of the persisted filter states of this entry
+    await runtime.store.async_load()
+
+    # ------------------------------------------------------------
+    # Compile patterns once (validation warnings logged once)
+    # ------------------------------------------------------------
+    matcher = PatternMatcher([_validate_pattern_item(p) for p in patterns_list])
+
     # ------------------------------------------------------------
     # Track existing lowpass entities (recursion guard)
     # ------------------------------------------------------------
@@ -84,6 +134,12 @@ async def async_setup_entry_loader(
         e.entity_id for e in reg0.entities.values() if e.platform == DOMAIN
     }
 
+    # ------------------------------------------------------------
+    # Entry write stats sensor (before any filtered sensor is added)
+    # ------------------------------------------------------------
+    if runtime.stats is not None:
+        runtime.stats.start(entry.entry_id, async_add_entities, own_entity_ids)
+
     # ------------------------------------------------------------
     # Build explicit configs
     # ------------------------------------------------------------
@@ -113,12 +169,24 @@ async def async_setup_entry_loader(
         explicit_meta[cfg.source] = meta
         desired_unique_ids.add(meta.unique_id)
 
+    # drop saved filter states that are no longer configured (pattern
+    # entities stay while registered: the rescan cleanup forgets them)
+    keep_store_ids = set(desired_unique_ids)
+    if patterns_list:
+        keep_store_ids.update(
+            e.unique_id
+            for e in reg0.entities.values()
+            if e.platform == DOMAIN and e.config_entry_id == entry.entry_id
+        )
+    runtime.store.prune(keep_store_ids)
+
     explicit_entities = [
         sensor_cls(
             hass,
             cfg,
             is_pattern=False,
             precomputed=explicit_meta[cfg.source],
+            runtime=runtime,
         )
         for cfg in explicit.values()
     ]
@@ -149,12 +217,13 @@ async def async_setup_entry_loader(
         # ------------------------------------------------------------
         # Scan sources
         # ------------------------------------------------------------
-        for p in patterns_list:
+        for i, p in enumerate(patterns_list):
 
-            pat = _validate_pattern_item(p)
-            if not pat:
+            regex = matcher.compiled.get(i)
+            if regex is None:
                 continue
 
+            pat = p.get(CONF_MATCH)
             local_count = 0
 
             reg = er.async_get(hass)
@@ -169,7 +238,7 @@ async def async_setup_entry_loader(
                 if eid in explicit:
                     continue
 
-                if not fnmatch.fnmatch(eid, pat):
+                if not regex.match(eid):
                     continue
 
                 if reg.async_get(eid) is None:
@@ -184,10 +253,10 @@ async def async_setup_entry_loader(
 
                 # -------- CREATE (filtré) --------
                 st = hass.states.get(eid)
-                if st is None:
-                    continue
-
-                if st.state in (None, "unavailable"):
+                if st is None or st.state in (None, "unavailable"):
+                    # registry discovery sees no later create event for it
+                    if discovery == "registry" and eid not in own_entity_ids:
+                        _wait_first_state(eid, i)
                     continue
 
                 # Recursion protection (entity_id only)
@@ -206,15 +275,17 @@ async def async_setup_entry_loader(
         # ------------------------------------------------------------
         # Compute keep_unique_ids
         # ------------------------------------------------------------
-        keep_unique_ids: set[str] = set()
+        keep_unique_ids: set[str] = {entry_stats_unique_id(entry.entry_id)}
 
         for cfg in explicit.values():
             meta = make_meta(hass, cfg, is_pattern=False)
             keep_unique_ids.add(meta.unique_id)
+            keep_unique_ids.add(stats_unique_id(meta.unique_id))
 
         for cfg in keep_cfgs.values():
             meta = make_meta(hass, cfg, is_pattern=True)
             keep_unique_ids.add(meta.unique_id)
+            keep_unique_ids.add(stats_unique_id(meta.unique_id))
 
         # ------------------------------------------------------------
         # CLEANUP (only if source truly gone)
@@ -231,6 +302,7 @@ async def async_setup_entry_loader(
             if entity.unique_id not in keep_unique_ids:
                 _LOGGER.warning("cleanup removing entity_id=%r unique_id=%r", entity.entity_id, entity.unique_id)
                 reg.async_remove(entity.entity_id)
+                runtime.store.forget(entity.unique_id)
 
         # ------------------------------------------------------------
         # CREATE
@@ -247,6 +319,7 @@ async def async_setup_entry_loader(
                 cfg,
                 is_pattern=True,
                 precomputed=meta,
+                runtime=runtime,
             )
 
             entities.append(ent)
@@ -273,6 +346,74 @@ async def async_setup_entry_loader(
 
     pattern_dynamic_created: set[str] = set()
 
+    # sources settled by _create_dynamic_entity (filter exists or never will)
+    pattern_handled_sources: set[str] = set()
+
+    @callback
+    def _create_dynamic_entity(new_eid: str, idx: int) -> bool:
+        """Create the entity for new_eid. False if its state is not valid yet."""
+
+        if new_eid in own_entity_ids:
+            return True
+
+        st = hass.states.get(new_eid)
+        if not st:
+            return False
+
+        if st.state in (None, "unknown", "unavailable"):
+            return False
+
+        cfg = build_cfg(
+            patterns_list[idx],
+            source=new_eid,
+            allow_unique_id=False,
+        )
+
+        meta = make_meta(hass, cfg, is_pattern=True)
+
+        reg = er.async_get(hass)
+
+        existing_entity_id = reg.async_get_entity_id(
+            "sensor",
+            DOMAIN,
+            meta.unique_id,
+        )
+
+        if existing_entity_id is not None:
+            return True
+
+        # unique_id protection (correct concept separation)
+        if meta.unique_id in desired_unique_ids:
+            return True
+
+        if len(pattern_dynamic_created) >= MAX_PATTERN_ENTITIES:
+            _LOGGER.error("patterns[]: dynamic creation aborted, limit=%d reached", MAX_PATTERN_ENTITIES)
+            return True
+
+        desired_unique_ids.add(meta.unique_id)
+        pattern_dynamic_created.add(meta.unique_id)
+
+        ent = sensor_cls(
+            hass,
+            cfg,
+            is_pattern=True,
+            precomputed=meta,
+            runtime=runtime,
+        )
+
+        async_add_entities([ent])
+
+        own_entity_ids.add(ent.entity_id)
+
+        suggested = getattr(ent, "_attr_suggested_object_id", None)
+        if suggested:
+            own_entity_ids.add(f"sensor.{suggested}")
+
+        return True
+
+    # ------------------------------------------------------------
+    # Discovery on the global state bus (default)
+    # ------------------------------------------------------------
     @callback
     def _maybe_add_new_entity(event):
 
@@ -283,74 +424,101 @@ async def async_setup_entry_loader(
         if not new_eid:
             return
 
-        st = hass.states.get(new_eid)
-        if not st:
+        # common case: one set lookup (matched source already filtered)
+        if new_eid in pattern_handled_sources or new_eid in explicit:
             return
 
-        if st.state in (None, "unknown", "unavailable"):
+        # then one negative-cache lookup
+        idx = matcher.match(new_eid)
+        if idx is None:
             return
 
-        if new_eid in explicit:
-            return
+        if _create_dynamic_entity(new_eid, idx):
+            pattern_handled_sources.add(new_eid)
 
-        for p in patterns_list:
+    # ------------------------------------------------------------
+    # Discovery on entity registry changes (no state bus overhead)
+    # ------------------------------------------------------------
+    pending_first_state: dict[str, Callable[[], None]] = {}
 
-            pat = _validate_pattern_item(p)
-            if not pat:
-                continue
+    @callback
+    def _wait_first_state(new_eid: str, idx: int) -> None:
+        """One-shot wait for the first valid state of this entity only."""
+        if new_eid in pending_first_state:
+            return
 
-            if not fnmatch.fnmatch(new_eid, pat):
-                continue
+        @callback
+        def _first_state(_event):
+            if _create_dynamic_entity(new_eid, idx):
+                pending_first_state.pop(new_eid)()
 
-            if new_eid in own_entity_ids:
-                return
+        pending_first_state[new_eid] = async_track_state_change_event(
+            hass,
+            [new_eid],
+            _first_state,
+        )
 
-            cfg = build_cfg(
-                p,
-                source=new_eid,
-                allow_unique_id=False,
-            )
+    @callback
+    def _cancel_first_state(eid: str | None) -> None:
+        unsub = pending_first_state.pop(eid, None)
+        if unsub is not None:
+            unsub()
 
-            meta = make_meta(hass, cfg, is_pattern=True)
+    @callback
+    def _maybe_add_registered_entity(event):
 
-            reg = er.async_get(hass)
+        action = event.data.get("action")
+        new_eid = event.data.get("entity_id")
 
-            existing_entity_id = reg.async_get_entity_id(
-                "sensor",
-                DOMAIN,
-                meta.unique_id,
-            )
+        if action == "remove":
+            _cancel_first_state(new_eid)
+            return
 
-            if existing_entity_id is not None:
+        if action == "update":
+            # only renames matter: the entity may now match (or stop matching)
+            old_eid = event.data.get("old_entity_id")
+            if old_eid is None:
                 return
+            _cancel_first_state(old_eid)
 
-            # unique_id protection (correct concept separation)
-            if meta.unique_id in desired_unique_ids:
-                return
+        elif action != "create":
+            return
 
-            if len(pattern_dynamic_created) >= MAX_PATTERN_ENTITIES:
-                _LOGGER.error("patterns[]: dynamic creation aborted, limit=%d reached", MAX_PATTERN_ENTITIES)
-                return
+        if hass.state != CoreState.running:
+            return
 
-            desired_unique_ids.add(meta.unique_id)
-            pattern_dynamic_created.add(meta.unique_id)
+        if not new_eid or new_eid in pending_first_state:
+            return
 
-            ent = sensor_cls(
-                hass,
-                cfg,
-                is_pattern=True,
-                precomputed=meta,
-            )
+        if new_eid in explicit:
+            return
 
-            async_add_entities([ent])
+        idx = matcher.match(new_eid)
+        if idx is None:
+            return
 
-            own_entity_ids.add(ent.entity_id)
+        if _create_dynamic_entity(new_eid, idx):
+            return
 
-            suggested = getattr(ent, "_attr_suggested_object_id", None)
-            if suggested:
-                own_entity_ids.add(f"sensor.{suggested}")
+        _wait_first_state(new_eid, idx)
 
-            break
+    @callback
+    def _cancel_pending_first_state():
+        for unsub in pending_first_state.values():
+            unsub()
+        pending_first_state.clear()
+
+    if not patterns_list:
+        return
+
+    if discovery == "registry":
+        unsub_registry = hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED,
+            _maybe_add_registered_entity,
+        )
+        entry.async_on_unload(unsub_registry)
+        entry.async_on_unload(_cancel_pending_first_state)
+        return
 
     unsub_state_changed = hass.bus.async_listen(
         "state_changed",
@@ -0,0 +1,85 @@
+import fnmatch
+import re
+
+NEGATIVE_CACHE_SIZE = 4096
+
+_WILDCARDS = "*?["
+
+
+def _literal_prefix(pattern: str) -> str:
+    for i, c in enumerate(pattern):
+        if c in _WILDCARDS:
+            return pattern[:i]
+    return pattern
+
+
+class PatternMatcher:
+    """Precompiled fnmatch patterns for entity_id matching.
+
+    - a prefix trie on the literal head of every pattern rejects most
+      entity_ids without running any regex
+    - a single combined regex (one named group per pattern) returns the
+      first matching pattern, same order as the patterns list
+    - a bounded negative cache makes repeated misses one dict lookup
+    """
+
+    def __init__(self, patterns, cache_size=NEGATIVE_CACHE_SIZE):
+        """patterns: list of fnmatch strings, None entries are skipped."""
+
+        self.compiled: dict[int, re.Pattern] = {}
+        self._trie: dict = {}
+        self._cache_size = cache_size
+        self._negative: dict[str, None] = {}
+
+        groups = []
+        for i, pat in enumerate(patterns):
+            if not pat:
+                continue
+
+            regex = fnmatch.translate(pat)
+            self.compiled[i] = re.compile(regex)
+            groups.append(f"(?P<p{i}>{regex})")
+
+            node = self._trie
+            for c in _literal_prefix(pat):
+                node = node.setdefault(c, {})
+            node[None] = True
+
+        self._combined = re.compile("|".join(groups)) if groups else None
+
+    # ------------------------------------------------------------
+    # Prefix trie: can any pattern match this entity_id?
+    # ------------------------------------------------------------
+    def _prefix_hit(self, entity_id: str) -> bool:
+        node = self._trie
+        if None in node:
+            return True
+
+        for c in entity_id:
+            node = node.get(c)
+            if node is None:
+                return False
+            if None in node:
+                return True
+
+        return False
+
+    # ------------------------------------------------------------
+    # First matching pattern index (or None)
+    # ------------------------------------------------------------
+    def match(self, entity_id: str) -> int | None:
+        if self._combined is None or entity_id in self._negative:
+            return None
+
+        m = None
+        if self._prefix_hit(entity_id):
+            m = self._combined.match(entity_id)
+
+        if m is None:
+            if len(self._negative) >= self._cache_size:
+                # drop oldest entry (dicts keep insertion order)
+                del self._negative[next(iter(self._negative))]
+            self._negative[entity_id] = None
+            return None
+
+        return int(m.lastgroup[1:])
@@ -0,0 +1,92 @@
+from bisect import bisect_left, insort
+from collections import deque
+
+# samples needed before anything is judged
+MIN_SAMPLES = 3
+
+# MAD -> sigma for Gaussian noise
+MAD_SCALE = 1.4826
+
+
+def _median(values):
+    n = len(values)
+    mid = n // 2
+    if n % 2:
+        return values[mid]
+    return 0.5 * (values[mid - 1] + values[mid])
+
+
+def outlier_filter(cfg):
+    """HampelFilter configured by cfg, or None (outlier: off)."""
+    if cfg.outlier == "off":
+        return None
+    return HampelFilter(cfg.outlier_window, cfg.outlier_k, clamp=cfg.outlier == "clamp")
+
+
+class HampelFilter:
+    """Hampel identifier over the last `window` raw source samples.
+
+    A sample farther than k * MAD-sigma from the window median is an
+    outlier: rejected (None) or clamped to the limit. Every raw sample
+    enters the window, so a genuine level shift passes once it holds
+    for about half the window. A window without spread (MAD = 0)
+    rejects nothing.
+
+    The window is also kept sorted, so the median is O(1). Each update
+    is a binary search plus an O(w) list shift on insert and evict
+    (a memmove, cheap at window sizes). The MAD itself is only computed
+    for samples beyond k times a quartile lower bound of it (rare).
+    """
+
+    __slots__ = ("k", "clamp", "_ring", "_sorted")
+
+    def __init__(self, window, k, clamp=False):
+        self.k = k
+        self.clamp = clamp
+
+        # arrival order + the same values kept sorted
+        self._ring = deque(maxlen=window)
+        self._sorted = []
+
+    def reset(self):
+        self._ring.clear()
+        self._sorted.clear()
+
+    def _push(self, x):
+        ring = self._ring
+        if len(ring) == ring.maxlen:
+            del self._sorted[bisect_left(self._sorted, ring[0])]
+        ring.append(x)
+        insort(self._sorted, x)
+
+    def filter(self, x):
+        """Return x, the clamped value, or None when x is rejected."""
+        window = self._sorted
+        out = x
+
+        n = len(window)
+        if n >= MIN_SAMPLES:
+            med = _median(window)
+            dev = abs(x - med)
+
+            # at least half of the deviations reach the inner quartile
+            # half-width, so it never exceeds the MAD: accept in O(1)
+            q = n // 4
+            low = min(med - window[q], window[n - 1 - q] - med) * MAD_SCALE
+            if dev <= self.k * low:
+                self._push(x)
+                return x
+
+            mad = _median(sorted(abs(v - med) for v in window)) * MAD_SCALE
+
+            limit = self.k * mad
+            if mad > 0 and dev > limit:
+                if not self.clamp:
+                    out = None
+                elif x > med:
+                    out = med + limit
+                else:
+                    out = med - limit
+
+        self._push(x)
+        return out
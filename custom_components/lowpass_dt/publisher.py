@@ -1,9 +1,28 @@
 import logging
-from types import SimpleNamespace
+from types import MappingProxyType
 import math
 
 _LOGGER = logging.getLogger(__name__)
 
+# state_class inferred from device_class when the source has none
+_MEASUREMENT_DEVICE_CLASSES = frozenset((
+    "power",
+    "current",
+    "voltage",
+    "temperature",
+    "humidity",
+    "pressure",
+    "frequency",
+    "signal_strength",
+))
+_TOTAL_INCREASING_DEVICE_CLASSES = frozenset((
+    "energy",
+    "gas",
+    "water",
+))
+
+_NO_ATTRIBUTES = MappingProxyType({})
+
 
 # ------------------------------------------------------------
 # Utility: derive rounding precision from fixed deadband
@@ -19,9 +38,57 @@ def _default_round_from_deadband(deadband: float | None) -> int:
     return min(6, max(0, int(math.ceil(-math.log10(deadband))) + 1))
 
 
+# ------------------------------------------------------------
+# Entity metadata derived from the source attributes
+# ------------------------------------------------------------
+def _derive_source_meta(attrs):
+    """Return (unit, icon, device_class, state_class, inferred_state_class)."""
+    device_class = attrs.get("device_class")
+
+    # Determine state_class:
+    # 1) Use source state_class if provided
+    # 2) Otherwise infer from device_class if provided
+    inferred = None
+    if device_class in _MEASUREMENT_DEVICE_CLASSES:
+        inferred = "measurement"
+    elif device_class in _TOTAL_INCREASING_DEVICE_CLASSES:
+        inferred = "total_increasing"
+
+    return (
+        attrs.get("unit_of_measurement"),
+        attrs.get("icon"),
+        device_class,
+        attrs.get("state_class"),
+        inferred,
+    )
+
+
 class Publisher:
     """Handle publishing filtered values and injected updates."""
 
+    __slots__ = (
+        "sensor",
+        "cfg",
+        "core",
+        "dt_silence",
+        "dt_output_mean",
+        "dt_output_m2",
+        "output_just_resumed",
+        "minimal_attributes",
+        "_debug_cfg",
+        "_debug_deadband",
+        "_meta_attrs",
+        "_meta",
+        "_staged",
+        "source_attributes",
+        "n_events",
+        "n_published",
+        "n_injected",
+        "n_converged",
+        "n_monotonic_blocked",
+        "n_outliers",
+    )
+
     def __init__(self, sensor, cfg, core):
         self.sensor = sensor
         self.cfg = cfg
@@ -39,6 +106,52 @@ class Publisher:
         # ------------------------------------------------------------
         self.output_just_resumed = False
 
+        # ------------------------------------------------------------
+        # Attribute mappings reused across writes (HA diffs them cheaply)
+        # ------------------------------------------------------------
+        self.minimal_attributes = MappingProxyType({"source": cfg.source})
+
+        # debug mode: config fields, cached per CoreParams block (any cfg
+        # change compiles a new one), and the last deadband dict with the
+        # live values it was built from
+        self._debug_cfg = None
+        self._debug_deadband = None
+
+        # source metadata, memoized on the identity of the attributes
+        # object (HA reuses it while the source attributes are unchanged)
+        self._meta_attrs = None
+        self._meta = None
+
+        # publish waiting for a write budget grant: (value, attributes, meta)
+        self._staged = None
+
+        # last real source attributes (set by the sensor on every event)
+        self.source_attributes = None
+
+        # ------------------------------------------------------------
+        # Write-reduction counters (read by the diagnostic sensors)
+        # ------------------------------------------------------------
+        self.n_events = 0
+        self.n_published = 0
+        self.n_injected = 0
+        self.n_converged = 0
+        self.n_monotonic_blocked = 0
+        self.n_outliers = 0
+
+    def counters(self):
+        """Counters in stats.COUNTERS order."""
+        core = self.core
+        return (
+            self.n_events,
+            self.n_published,
+            core.n_deadband,
+            core.n_rate_blocked,
+            self.n_injected,
+            self.n_converged,
+            self.n_monotonic_blocked,
+            self.n_outliers,
+        )
+
     # ------------------------------------------------------------
     # Convergence detection (NO LOGIC CHANGE)
     # ------------------------------------------------------------
@@ -107,12 +220,114 @@ class Publisher:
 
         return dt_output_sigma
 
+    # ------------------------------------------------------------
+    # Write budget priority: |err| / deadband vs last published
+    # ------------------------------------------------------------
+    def _write_priority(self, deadband):
+        if self.core.last_published is None or deadband <= 0:
+            return math.inf
+
+        if self.cfg.circular is None:
+            err = self.core.y - self.core.last_published
+        else:
+            err = (
+                (self.core.y - self.core.last_published + self.cfg.circular / 2)
+                % self.cfg.circular
+            ) - self.cfg.circular / 2
+
+        return abs(err) / deadband
+
+    # ------------------------------------------------------------
+    # Debug attributes (config part cached, live fields per publish)
+    # ------------------------------------------------------------
+    def _debug_cfg_part(self):
+        """(CoreParams, top-level config fields, deadband config fields)."""
+        p = self.core._p
+        cached = self._debug_cfg
+        if cached is not None and cached[0] is p:
+            return cached
+
+        cfg = self.cfg
+        cached = self._debug_cfg = (
+            p,
+            {
+                "source": cfg.source,
+                "unique_id": self.sensor._unique_id_seed,
+
+                "tau_filter": cfg.tau,
+                "filter": cfg.filter,
+                "max_rate_dt": cfg.max_rate_dt,
+                "min_rate_dt": cfg.min_rate_dt,
+            },
+            {
+                "deadband_tau_sigma": cfg.deadband_tau_sigma,
+                **(
+                    {"deadband_k_sigma": cfg.deadband_k_sigma}
+                    if cfg.deadband is None
+                    else {}
+                ),
+            },
+        )
+        self._debug_deadband = None
+        return cached
+
+    def _build_debug_attributes(
+        self,
+        y,
+        dt,
+        dt_silence,
+        silent,
+        deadband,
+        src_mean,
+        src_sigma,
+        dt_output,
+        dt_output_mean,
+        dt_output_sigma,
+    ):
+        _, cfg_part, deadband_cfg = self._debug_cfg_part()
+
+        # statistics only move on real samples: injected publishes reuse
+        # the previous dict (never mutated once published)
+        live = (deadband, src_mean, src_sigma)
+        cached = self._debug_deadband
+        if cached is not None and cached[0] == live:
+            deadband_attrs = cached[1]
+        else:
+            deadband_attrs = {
+                "deadband": deadband,
+                **deadband_cfg,
+                "deadband_filtered_mean": src_mean,
+                "deadband_filtered_sigma": src_sigma,
+            }
+            self._debug_deadband = (live, deadband_attrs)
+
+        attributes = dict(cfg_part)
+        attributes["filter_output"] = float(y)
+
+        attributes["source_dt"] = {
+            "source_dt": dt,
+            "source_silence_3sigma": dt_silence,
+            "silent": silent,
+        }
+
+        attributes["deadband"] = deadband_attrs
+
+        attributes["dt_output"] = {
+            "dt_output": dt_output,
+            "dt_output_mean": dt_output_mean,
+            "dt_output_sigma": dt_output_sigma,
+        }
+
+        return MappingProxyType(attributes)
+
     # ------------------------------------------------------------
     # MAIN PUBLISH
     # ------------------------------------------------------------
     def publish(self, src_state, now, dt, force, injected):
         """Publish filtered value to Home Assistant."""
+        self._publish(src_state.attributes, now, dt, injected)
 
+    def _publish(self, attrs, now, dt, injected):
         s = self.sensor
         inj = self.sensor.injector
         last_src = s._last_source_value
@@ -135,10 +350,10 @@ class Publisher:
         # 3. Publication rule
         # ------------------------------------------------------------
         if not converged:
-            if not self.core.should_publish(now):
+            if not self.core.should_publish(now, injected):
                 return
 
-        attrs = src_state.attributes or {}
+        attrs = attrs or _NO_ATTRIBUTES
 
         # ------------------------------------------------------------
         # 4. Detect source resume ignore first dt_output
@@ -161,48 +376,13 @@ class Publisher:
         dt_output_sigma = self._update_dt_output_stats(dt_output)
 
         # ------------------------------------------------------------
-        # 7. Standard HA fields
+        # 7. Standard HA fields (applied with the value, see _apply)
         # ------------------------------------------------------------
-        s._attr_native_unit_of_measurement = attrs.get("unit_of_measurement")
-        s._attr_icon = attrs.get("icon")
-
-        # Copy device_class (runtime safe)
-        device_class = attrs.get("device_class")
-        s._attr_device_class = device_class
-
-        # Determine state_class:
-        # 1) Use source state_class if provided
-        # 2) Otherwise infer from device_class if provided
+        if attrs is not self._meta_attrs:
+            self._meta_attrs = attrs
+            self._meta = _derive_source_meta(attrs)
 
-        # Source state_class (if explicitly provided by source)
-        state_class = attrs.get("state_class")
-        if state_class is not None:
-            # Always trust explicit source state_class
-            s._attr_state_class = state_class
-
-        else:
-            # No state_class from source → infer from device_class
-            # Only set it once to avoid HA warnings
-            if getattr(s, "_attr_state_class", None) is None:
-
-                if device_class in (
-                    "power",
-                    "current",
-                    "voltage",
-                    "temperature",
-                    "humidity",
-                    "pressure",
-                    "frequency",
-                    "signal_strength",
-                ):
-                    s._attr_state_class = "measurement"
-
-                elif device_class in (
-                    "energy",
-                    "gas",
-                    "water",
-                ):
-                    s._attr_state_class = "total_increasing"
+        meta = self._meta
 
         # ------------------------------------------------------------
         # 8. Apply convergence override if needed
@@ -230,10 +410,17 @@ class Publisher:
         # 10. Monoticity
         # ------------------------------------------------------------
 
-        prev = s._attr_native_value
+        # compare with the latest value, even if still waiting for the budget
+        staged = self._staged
+        prev = s._attr_native_value if staged is None else staged[0]
+
+        # state_class as _apply will set it
+        state_class = meta[3] if meta[3] is not None else s._attr_state_class
+        if state_class is None:
+            state_class = meta[4]
 
         if (
-            s._attr_state_class == "total_increasing"
+            state_class == "total_increasing"
             and prev is not None
             and reported < prev
         ):
@@ -255,74 +442,103 @@ class Publisher:
                     reported,
                 )
 
+                self.n_monotonic_blocked += 1
                 return
 
-        s._attr_native_value = reported
-
         # ------------------------------------------------------------
         # 11. Attributes
         # ------------------------------------------------------------
 
         if not self.cfg.debug:
 
-            # minimal attributes
-            s._attr_extra_state_attributes = {
-                "source": self.cfg.source,
-            }
+            # minimal attributes (shared, read-only)
+            attributes = self.minimal_attributes
 
         else:
 
-            # full debug attributes
-            s._attr_extra_state_attributes = {
-                "source": self.cfg.source,
-                "unique_id": s._unique_id_seed,
-
-                "tau_filter": self.cfg.tau,
-                "max_rate_dt": self.cfg.max_rate_dt,
-                "min_rate_dt": self.cfg.min_rate_dt,
-                "filter_output": float(self.core.y),
-
-                "source_dt": {
-                    "source_dt": dt,
-                    "source_silence_3sigma": self.dt_silence,
-                    "silent": inj.silent,
-                },
-
-                "deadband": {
-                    "deadband": self.core.effective_deadband(),
-                    "deadband_tau_sigma": self.cfg.deadband_tau_sigma,
-                    **(
-                        {"deadband_k_sigma": self.cfg.deadband_k_sigma}
-                        if self.cfg.deadband is None
-                        else {}
-                    ),
-                "deadband_filtered_mean": self.core.src_mean,
-                "deadband_filtered_sigma": self.core.src_sigma,
-                },
-
-                "dt_output": {
-                    "dt_output": dt_output,
-                    "dt_output_mean": self.dt_output_mean,
-                    "dt_output_sigma": dt_output_sigma,
-                },
-        }
+            # full debug attributes: only the live fields are rebuilt
+            attributes = self._build_debug_attributes(
+                self.core.y,
+                dt,
+                self.dt_silence,
+                inj.silent,
+                deadband,
+                self.core.src_mean,
+                self.core.src_sigma,
+                dt_output,
+                self.dt_output_mean,
+                dt_output_sigma,
+            )
 
         # ------------------------------------------------------------
         # 12. Finalize
         # ------------------------------------------------------------
+        budget = s.runtime.budget
+        if budget is not None:
+            priority = self._write_priority(deadband)
+
         self.core.finalize_publish(now)
-        s.async_write_ha_state()
+
+        if injected:
+            self.n_injected += 1
+        if converged:
+            self.n_converged += 1
+
+        if budget is None:
+            self._apply(reported, attributes, meta)
+            s.runtime.writer.mark(s)
+        else:
+            # the entity keeps its written value until the budget grants
+            # the write: other writes (name, HA) must not leak this one
+            self._staged = (reported, attributes, meta)
+            budget.submit(s, priority)
+
+    def apply_staged(self):
+        """Write budget grant: move the staged publish onto the entity."""
+        staged = self._staged
+        if staged is None:
+            return
+
+        self._staged = None
+        self._apply(*staged)
+
+    def _apply(self, reported, attributes, meta):
+        s = self.sensor
+        unit, icon, device_class, state_class, inferred = meta
+
+        s._attr_native_unit_of_measurement = unit
+        s._attr_icon = icon
+
+        # Copy device_class (runtime safe)
+        s._attr_device_class = device_class
+
+        if state_class is not None:
+            # Always trust explicit source state_class
+            s._attr_state_class = state_class
+
+        elif inferred is not None and getattr(s, "_attr_state_class", None) is None:
+            # No state_class from source → infer from device_class
+            # Only set it once to avoid HA warnings
+            s._attr_state_class = inferred
+
+        s._attr_native_value = reported
+        s._attr_extra_state_attributes = attributes
+
+        self.n_published += 1
 
     # ------------------------------------------------------------
-    # Injected publication (unchanged)
+    # Injected publication (reuses the last real source attributes)
     # ------------------------------------------------------------
     def publish_injected(self, last_source_value, now, dt):
-        src = self.sensor.hass.states.get(self.cfg.source)
-        attrs = src.attributes if src else {}
-
-        fake = SimpleNamespace(
-            attributes=attrs,
-            state=str(last_source_value),
-        )
-
-        self.publish(fake, now, dt, force=False, injected=True)
\ No newline at end of file
+        attrs = self.source_attributes
+        if attrs is None:
+            # no real event yet (restored state): read the source once
+            src = self.sensor.hass.states.get(self.cfg.source)
+            attrs = self.source_attributes = src.attributes if src else None
+
+        # the injection step moved the filter state
+        store = self.sensor.runtime.store
+        if store is not None:
+            store.touch()
+
+        self._publish(attrs, now, dt, injected=True)
\ No newline at end of file
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# sensors restored between two yields to the event loop
+RESTORE_CHUNK = 100
+
+
+class RestoreBatch:
+    """Restore the sensors of one config entry in a background task.
+
+    Sensors register their listeners when added and queue source events
+    while restoring. All sensors added in one loop iteration are restored
+    by a single background task, so entity setup (and HA boot) never
+    waits for the restore lookups; each sensor then replays its queued
+    events in timestamp order.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+
+        # insertion-ordered set of sensors waiting for their restore
+        self._pending: dict = {}
+        self._handle = None
+        self._running = False
+        self._stopped = False
+
+    # ------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------
+    @callback
+    def add(self, sensor) -> None:
+        if self._stopped:
+            return
+
+        self._pending[sensor] = None
+        if self._handle is None and not self._running:
+            self._handle = self.hass.loop.call_soon(self._start)
+
+    @callback
+    def discard(self, sensor) -> None:
+        self._pending.pop(sensor, None)
+
+    @callback
+    def stop(self) -> None:
+        self._stopped = True
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pending.clear()
+
+    # ------------------------------------------------------------
+    # Batch
+    # ------------------------------------------------------------
+    @callback
+    def _start(self) -> None:
+        self._handle = None
+        self._running = True
+        self.hass.async_create_background_task(
+            self._async_run(),
+            "lowpass_dt restore",
+        )
+
+    async def _async_run(self) -> None:
+        done = 0
+
+        try:
+            # sensors added while this batch runs join it
+            while self._pending and not self._stopped:
+                sensor = next(iter(self._pending))
+                del self._pending[sensor]
+
+                try:
+                    await sensor._async_restore()
+                except Exception:  # one broken state must not block the batch
+                    _LOGGER.exception("restore failed for %s", sensor.entity_id)
+
+                sensor._finish_restore()
+
+                done += 1
+                if done % RESTORE_CHUNK == 0:
+                    await asyncio.sleep(0)
+        finally:
+            self._running = False
+
+        _LOGGER.debug("restored %d sensors", done)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .backfill import RecorderBackfill
+from .budget import WriteBudget
+from .coalescer import WriteCoalescer
+from .dispatcher import SourceDispatcher
+from .restorer import RestoreBatch
+from .scheduler import TimerWheel
+from .stats import WriteStats
+from .store import FilterStore
+
+# Time source of the entry (epoch seconds). Replaced by the offline load
+# harness to run the real code paths on a virtual clock.
+wall_clock = time.time
+
+
+class LowpassRuntime:
+    """Services shared by all filtered sensors of one config entry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        write_budget: tuple[float, float] | None = None,
+        backfill: bool = False,
+        diagnostics: str = "off",
+        entry_id: str | None = None,
+    ) -> None:
+        self.hass = hass
+
+        # single timer wheel for all silence / injection deadlines
+        self.wheel = TimerWheel(hass.loop, clock=wall_clock)
+
+        # single state_changed subscription for all sources
+        self.dispatcher = SourceDispatcher(hass)
+
+        # sensor restores batched in a background task
+        self.restorer = RestoreBatch(hass)
+
+        # filter state of all sensors in one Store file (loaded by the loader)
+        self.store = FilterStore(hass, entry_id) if entry_id is not None else None
+
+        # optional warm-up of new filters from recorder history
+        self.backfill = RecorderBackfill(hass, wall_clock) if backfill else None
+
+        # state writes coalesced into one flush per loop iteration
+        self.writer = WriteCoalescer(hass.loop)
+
+        # optional entry-wide recorder write budget
+        self.budget = None
+        if write_budget is not None:
+            rate, burst = write_budget
+            self.budget = WriteBudget(
+                hass.loop,
+                rate,
+                burst,
+                clock=hass.loop.time,
+                write=self._write_granted,
+            )
+
+        # write-reduction diagnostic sensors (started by the loader)
+        self.stats = None
+        if diagnostics != "off":
+            self.stats = WriteStats(hass, self.writer, per_sensor=diagnostics == "sensor")
+
+    def _write_granted(self, sensor) -> None:
+        """Write budget grant: apply the staged publish, then write it."""
+        sensor.publisher.apply_staged()
+        self.writer.mark(sensor)
+
+    # ------------------------------------------------------------
+    # Teardown (config entry unload)
+    # ------------------------------------------------------------
+    async def async_stop(self) -> None:
+        """Stop, then wait for the final filter state save."""
+        self.stop()
+        if self.store is not None:
+            await self.store.async_stop()
+
+    def stop(self) -> None:
+        self.restorer.stop()
+        if self.stats is not None:
+            self.stats.stop()
+        if self.backfill is not None:
+            self.backfill.stop()
+        self.dispatcher.stop()
+        self.wheel.stop()
+        if self.budget is not None:
+            self.budget.stop()
+        self.writer.stop()
@@ -0,0 +1,89 @@
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# ------------------------------------------------------------
+# Per-sample steps shared by LowpassDtSensor and the offline replay
+# ------------------------------------------------------------
+def sample_time(sensor, event, new_state) -> float:
+    """Sample time of a source event (epoch seconds, never decreasing)."""
+    mode = sensor.cfg.timestamp
+
+    now = None
+    if mode == "state":
+        now = getattr(new_state, "last_updated_timestamp", None)
+    elif mode == "event":
+        now = getattr(event, "time_fired_timestamp", None)
+
+    # processing time (also the fallback when no timestamp is available)
+    if now is None:
+        now = sensor.runtime.wheel.clock()
+
+    # a queued event may predate the last filter step (injection)
+    t_prev = sensor.core.t_prev
+    if t_prev is not None and now < t_prev:
+        now = t_prev
+
+    return now
+
+
+def process_sample(sensor, new_state, x, now) -> None:
+    """Run one numeric source sample through pre-filter, core and publisher."""
+
+    # outlier pre-filter: rejected samples never reach the core
+    if sensor.outlier is not None:
+        filtered = sensor.outlier.filter(x)
+        if filtered != x:
+            sensor.publisher.n_outliers += 1
+            _LOGGER.debug("outlier %s for %s: %.6f -> %s", sensor.cfg.outlier, sensor.entity_id, x, filtered)
+            if filtered is None:
+                return
+            x = filtered
+
+    core = sensor.core
+
+    # RESET detection (strong drop only)
+    prev_src = sensor._last_source_value
+    if (sensor._attr_state_class == "total_increasing" and prev_src is not None and x < prev_src * 0.5 ):
+        _LOGGER.debug("total_increasing RESET detected for source %s dropped from %.6f to %.6f", sensor.entity_id, prev_src, x)
+
+        # Hard reset of filter state
+        core.y = x
+        core.last_published = x
+        core.err_i = 0.0
+        core.v = 0.0
+        core.t_prev = now
+
+        sensor._reset_pending = True
+
+    # Update last source value
+    sensor._last_source_value = x
+
+    # history not loaded yet: replayed underneath this sample later
+    if sensor._backfill_live is not None:
+        sensor._backfill_live.append((now, x))
+
+    # Update dt stats + stop injector
+    sensor.injector.set_last_source_time(now)
+
+    # Update filter with real measurement
+    dt = core.update_from_source(x, now)
+
+    store = sensor.runtime.store
+    if store is not None:
+        store.touch()
+
+    # PASS dt_silence_raw + source attributes TO PUBLISHER
+    publisher = sensor.publisher
+    publisher.dt_silence = sensor.injector.dt_silence_raw
+    publisher.source_attributes = new_state.attributes
+
+    # Publish real measurement
+    publisher.publish(
+        new_state,
+        now,
+        dt,
+        force=False,
+        injected=False,
+    )
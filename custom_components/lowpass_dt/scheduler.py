@@ -0,0 +1,127 @@
+import math
+import time
+
+
+class WheelTimer:
+    """One re-armable deadline registered in a TimerWheel."""
+
+    __slots__ = ("callback", "deadline", "tick")
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.deadline = None
+        self.tick = None
+
+    @property
+    def armed(self):
+        return self.tick is not None
+
+
+class TimerWheel:
+    """Hashed timer wheel shared by all injectors of a config entry.
+
+    Timers are allocated once per owner and re-armed in O(1): arming only
+    moves the timer between two bucket dicts, no loop handle is created.
+    A single loop callback runs every `resolution` seconds while at least
+    one timer is armed and fires every due deadline.
+    """
+
+    def __init__(self, loop, *, clock=time.time, resolution=1.0, slots=512):
+        self.loop = loop
+        self.clock = clock
+        self.resolution = float(resolution)
+        self._slots = int(slots)
+        self._buckets = [dict() for _ in range(self._slots)]
+        self._armed = 0
+        self._last_tick = None
+        self._handle = None
+        self._in_tick = False
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+    def timer(self, callback):
+        """Create a timer calling callback(now) when its deadline is reached."""
+        return WheelTimer(callback)
+
+    def arm(self, timer, delay):
+        """(Re-)arm timer to fire `delay` seconds from now."""
+        self.arm_at(timer, self.clock() + max(0.0, delay))
+
+    def arm_at(self, timer, deadline):
+        """(Re-)arm timer to fire at absolute clock time `deadline`."""
+        if timer.tick is not None:
+            del self._buckets[timer.tick % self._slots][timer]
+        else:
+            self._armed += 1
+
+        if self._handle is None and not self._in_tick:
+            now = self.clock()
+            self._last_tick = math.floor(now / self.resolution)
+            self._schedule_tick(now)
+
+        # never land in a bucket that has already been scanned
+        timer.deadline = deadline
+        timer.tick = max(math.ceil(deadline / self.resolution), self._last_tick + 1)
+        self._buckets[timer.tick % self._slots][timer] = None
+
+    def cancel(self, timer):
+        """Disarm timer (safe to call when not armed)."""
+        if timer.tick is None:
+            return
+
+        del self._buckets[timer.tick % self._slots][timer]
+        timer.tick = None
+        self._armed -= 1
+
+    def stop(self):
+        """Disarm everything and stop ticking."""
+        for bucket in self._buckets:
+            for timer in bucket:
+                timer.tick = None
+            bucket.clear()
+
+        self._armed = 0
+
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    # ------------------------------------------------------------
+    # Loop callback (aligned on resolution boundaries)
+    # ------------------------------------------------------------
+    def _schedule_tick(self, now):
+        delay = (self._last_tick + 1) * self.resolution - now
+        self._handle = self.loop.call_later(max(0.0, delay), self._on_tick)
+
+    def _on_tick(self):
+        self._handle = None
+
+        # the loop clock may wake us marginally before the boundary
+        now = self.clock()
+        current = max(math.floor(now / self.resolution), self._last_tick + 1)
+
+        # catch up if the loop was late, never scan a bucket twice
+        first = max(self._last_tick + 1, current - self._slots + 1)
+        self._last_tick = current
+
+        due = []
+        for tick in range(first, current + 1):
+            bucket = self._buckets[tick % self._slots]
+            for timer in bucket:
+                if timer.tick <= current:
+                    due.append(timer)
+
+        self._in_tick = True
+        try:
+            for timer in due:
+                # skip timers re-armed or cancelled by an earlier callback
+                if timer.tick is None or timer.tick > current:
+                    continue
+                self.cancel(timer)
+                timer.callback(now)
+        finally:
+            self._in_tick = False
+
+        if self._armed and self._handle is None:
+            self._schedule_tick(now)
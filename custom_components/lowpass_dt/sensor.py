@@ -6,22 +6,24 @@ from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback, Event
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.restore_state import ExtraStoredData
-from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
 
 from .config import (
     LowpassCfg,
     CfgMeta,
+    apply_state_class,
     compute_name_and_slug,
 )
 
 from .filter import LowpassCore
 from .injector import TauInjector
+from .outlier import outlier_filter
 from .publisher import Publisher
+from .runtime import LowpassRuntime
+from .sample import process_sample, sample_time
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -72,28 +74,45 @@ class LowpassDtSensor(SensorEntity, RestoreEntity):
         cfg: LowpassCfg,
         is_pattern: bool,
         precomputed: CfgMeta | None = None,
+        runtime: LowpassRuntime | None = None,
     ) -> None:
 
         self.hass = hass
         self.cfg = cfg
         self.is_pattern = is_pattern
 
+        # shared per-entry services (timer wheel, ...)
+        if runtime is None:
+            runtime = LowpassRuntime(hass)
+        self.runtime = runtime
+
         self.core = LowpassCore(cfg)
         self.publisher = Publisher(self, cfg, self.core)
 
         self._last_source_value = None
         self._reset_pending = False
 
+        # optional outlier pre-filter (before the core)
+        self.outlier = outlier_filter(cfg)
+
         self.injector = TauInjector(
             hass,
             cfg,
             self.core,
             lambda: self._last_source_value,
             self.publisher.publish_injected,
+            runtime.wheel,
         )
 
-        self._unsub_source = None
-        self._unsub_name = None
+        # dynamic friendly name: refreshed once on first source event
+        self._name_pending = False
+
+        # live (t, x) samples while a recorder backfill is pending
+        self._backfill_live = None
+
+        # (t, new_state, x) source events received before the restore ran
+        self._restoring = False
+        self._restore_queue = None
 
         # ------------------------------------------------------------
         # Decide name_final, slug, use_name_mode
@@ -164,24 +183,13 @@ class LowpassDtSensor(SensorEntity, RestoreEntity):
         self._attr_extra_state_attributes = {}
 
     async def async_added_to_hass(self) -> None:
-        """Restore internal state and register listeners."""
-
-        # ------------------------------------------------------------
-        # NEW HA-native restore
-        # ------------------------------------------------------------
+        """Restore the visible state, register listeners; filter state follows in the restore batch."""
 
         await super().async_added_to_hass()
 
-        # ------------------------------------------------------------
-        # Restore extra_data
-        # ------------------------------------------------------------
-        data = await self.async_get_last_extra_data()
-
-        if data:
-            self._restore_internal_state(data.as_dict())
-        else:
-            if self.entity_id == f"sensor.{self._attr_suggested_object_id}":
-                _LOGGER.warning("context lost or new entity for %r (empty filter state).", self.entity_id)
+        # source events are queued until the restore batch ran
+        self._restoring = True
+        self._restore_queue = []
 
         # ------------------------------------------------------------
         # Rename via registry (deferred, safe)
@@ -201,10 +209,67 @@ class LowpassDtSensor(SensorEntity, RestoreEntity):
 
         self.hass.async_create_task(_deferred_rename())
 
+        # before HA's first write of this entity (no "unknown" in between)
+        await self._async_restore_visible_state()
+
+        # ------------------------------------------------------------
+        # Dynamic naming only when name mode is not active
+        # ------------------------------------------------------------
+        self._name_pending = not self._use_name_mode
 
         # ------------------------------------------------------------
-        # Restore last visible state (robust + immediate write)
+        # Source state listener (shared per-entry dispatcher)
         # ------------------------------------------------------------
+        self.runtime.dispatcher.add(self)
+
+        # write-reduction diagnostics
+        if self.runtime.stats is not None:
+            self.runtime.stats.add(self)
+
+        self.runtime.restorer.add(self)
+
+        _LOGGER.debug("entity added: %s source=%s", self.entity_id, self.cfg.source)
+
+    # ------------------------------------------------------------
+    # Restore filter state (run by the entry's RestoreBatch)
+    # ------------------------------------------------------------
+    async def _async_restore(self) -> None:
+        """Restore the internal filter state."""
+
+        # ------------------------------------------------------------
+        # Restore filter state: entry store, else legacy extra_data
+        # ------------------------------------------------------------
+        store = self.runtime.store
+        data = store.get(self.unique_id) if store is not None else None
+
+        if data is None:
+            extra = await self.async_get_last_extra_data()
+            if extra:
+                data = extra.as_dict()
+
+        if store is not None:
+            store.add(self)
+
+        if data:
+            self._restore_internal_state(data)
+        else:
+            if self.entity_id == f"sensor.{self._attr_suggested_object_id}":
+                _LOGGER.warning("context lost or new entity for %r (empty filter state).", self.entity_id)
+
+            # warm up the sigma / dt statistics from recorder history
+            if self.runtime.backfill is not None:
+                self.runtime.backfill.add(self)
+
+        # the restored visible value wins over the stored filter output
+        if self._attr_native_value is not None:
+            self.core.y = self._attr_native_value
+
+    # ------------------------------------------------------------
+    # Restore last visible state (before the first write)
+    # ------------------------------------------------------------
+    async def _async_restore_visible_state(self) -> None:
+        """Restore value, unit and classes; HA writes them right after the add."""
+
         last_state = await self.async_get_last_state()
         src = self.hass.states.get(self.cfg.source)
 
@@ -235,13 +300,8 @@ class LowpassDtSensor(SensorEntity, RestoreEntity):
         if state_class:
             self._attr_state_class = state_class
 
-        if self.cfg.circular is not None and self._attr_state_class == "total_increasing":
-            _LOGGER.warning(
-                "Sensor %s configured as circular (period=%s) but state_class=total_increasing. Disabling circular mode.",
-                self.entity_id,
-                self.cfg.circular,
-            )
-            self.cfg.circular = None
+        if apply_state_class(self.cfg, self._attr_state_class, self.entity_id):
+            self.core.set_cfg(self.cfg)
 
         # ---- DEVICE CLASS ----
         device_class = restore_attrs.get("device_class")
@@ -259,16 +319,14 @@ class LowpassDtSensor(SensorEntity, RestoreEntity):
             self.core.y = self._attr_native_value
 
         # ---- SOURCE via EXTRA_STATE ----
-        self._attr_extra_state_attributes["source"] = self.cfg.source
+        self._attr_extra_state_attributes = self.publisher.minimal_attributes
 
-        # ---- WRITE IMMEDIATELY IF STRUCTURE EXISTS ----
-        if (
+        # ---- STRUCTURE CHECK (HA writes the entity after async_added_to_hass) ----
+        if not (
             self._attr_native_unit_of_measurement
             or self._attr_state_class
             or self._attr_device_class
         ):
-            self.async_write_ha_state()
-        else:
             _LOGGER.warning(
                 "restore failed for %r — no structural attributes (restore=%s, source=%s)",
                 self.entity_id,
@@ -276,47 +334,49 @@ class LowpassDtSensor(SensorEntity, RestoreEntity):
                 list(source_attrs.keys()) if source_attrs else [],
             )
 
-        # ------------------------------------------------------------
-        # Dynamic naming only when name mode is not active
-        # ------------------------------------------------------------
-        if not self._use_name_mode:
-
-            @callback
-            def _update_name(_event):
-                st2 = self.hass.states.get(self.cfg.source)
-                if st2 is not None:
-                    base2 = (st2.attributes or {}).get("friendly_name")
-                    if base2 and not base2.startswith("sensor."):
-                        self._attr_name = f"{base2} {self.cfg.suffix}"
-                        self.async_write_ha_state()
-
-                if self._unsub_name:
-                    self._unsub_name()
-                    self._unsub_name = None
-
-            self._unsub_name = async_track_state_change_event(
-                self.hass,
-                [self.cfg.source],
-                _update_name,
-            )
+    @callback
+    def _finish_restore(self) -> None:
+        """Leave restoring mode: replay queued source events in time order."""
+        if not self._restoring:
+            return  # removed while restoring
 
-        # ------------------------------------------------------------
-        # Source state listener
-        # ------------------------------------------------------------
-        self._unsub_source = async_track_state_change_event(
-            self.hass,
-            [self.cfg.source],
-            self._handle_source_event,
-        )
+        queued = self._restore_queue
+        self._restoring = False
+        self._restore_queue = None
+
+        if queued:
+            queued.sort(key=lambda item: item[0])
+            for now, new_state, x in queued:
+                t_prev = self.core.t_prev
+                if t_prev is not None and now < t_prev:
+                    now = t_prev
+                self._process_sample(new_state, x, now)
+
+            _LOGGER.debug("replayed %d queued events for %s", len(queued), self.entity_id)
 
         # simulate silence timer expiration after restore
-        if self.core.y is not None and self._last_source_value is not None:
+        elif self.core.y is not None and self._last_source_value is not None:
             self.hass.loop.call_soon(self.injector._on_silence_detected, None)
         else:
             _LOGGER.debug("no source or outpup value for %s source=%s", self.entity_id, self.cfg.source)
 
-
-        _LOGGER.debug("entity added: %s source=%s", self.entity_id, self.cfg.source)
+    async def async_will_remove_from_hass(self) -> None:
+        """Release listeners and shared timer wheel deadlines."""
+
+        self.runtime.restorer.discard(self)
+        self._restoring = False
+        self._restore_queue = None
+        self.injector.stop()
+        self.runtime.dispatcher.remove(self)
+        if self.runtime.budget is not None:
+            self.runtime.budget.discard(self)
+        self.runtime.writer.discard(self)
+        if self.runtime.backfill is not None:
+            self.runtime.backfill.discard(self)
+        if self.runtime.stats is not None:
+            self.runtime.stats.discard(self)
+        if self.runtime.store is not None:
+            self.runtime.store.remove(self)
 
     # ------------------------------------------------------------
     # Restore internal engine state (HA-native)
@@ -331,10 +391,17 @@ class LowpassDtSensor(SensorEntity, RestoreEntity):
         lp = data.get("low_pass", {})
         core.y = lp.get("y")
         core.t_prev = lp.get("t_prev")
+        core.v = lp.get("v") or 0.0
         core.time_last_pub = lp.get("time_last_pub")
         core.err_i = lp.get("err_i", 0.0)
         core.last_published = lp.get("last_published")
 
+        # Kalman engine
+        kalman = data.get("kalman", {})
+        core.kp = kalman.get("p") or 0.0
+        core.kq = kalman.get("q") or 0.0
+        core.kr = kalman.get("r") or 0.0
+
         # EMA filtered signal
         ema = data.get("ema_source", {})
         core.src_mean = ema.get("src_mean")
@@ -356,20 +423,65 @@ class LowpassDtSensor(SensorEntity, RestoreEntity):
         pub.dt_output_mean = dt_out.get("dt_output_mean")
         pub.dt_output_m2 = dt_out.get("dt_output_m2")
 
+    # ------------------------------------------------------------
+    # Warm-up from recorder history (no restore data)
+    # ------------------------------------------------------------
+    def _apply_backfill(self, samples):
+        core = self.core
+        inj = self.injector
+
+        # rebuild filter, engine state (second-order, Kalman noises) and
+        # statistics from the oldest sample; live samples are replayed last
+        core.reset_filter()
+        inj.dt_mean = None
+        inj.dt_m2 = None
+        inj.t_last_source = None
+
+        # spikes in the history must not inflate sigma either
+        outlier = self.outlier
+        if outlier is not None:
+            outlier.reset()
+
+        for t, x in samples:
+            if outlier is not None:
+                x = outlier.filter(x)
+                if x is None:
+                    continue
+            inj.seed_source_time(t)
+            core.update_from_source(x, t)
+
+        _LOGGER.debug(
+            "backfilled %s from %d samples (sigma=%s, dt_silence=%s)",
+            self.entity_id,
+            len(samples),
+            core.src_sigma,
+            inj.dt_silence_raw,
+        )
+
     # ------------------------------------------------------------
     # Export internal state (HA-native persistence)
     # ------------------------------------------------------------
 
     @property
     def extra_restore_state_data(self):
+        # persisted by the entry store instead (one file for all sensors)
+        if self.runtime.store is not None:
+            return None
+
         data = {
             "low_pass": {
                 "y": self.core.y,
                 "t_prev": self.core.t_prev,
+                "v": self.core.v,
                 "time_last_pub": self.core.time_last_pub,
                 "err_i": self.core.err_i,
                 "last_published": self.core.last_published,
             },
+            "kalman": {
+                "p": self.core.kp,
+                "q": self.core.kq,
+                "r": self.core.kr,
+            },
             "ema_source": {
                 "src_mean": self.core.src_mean,
                 "src_m2": self.core.src_m2,
@@ -388,12 +500,30 @@ class LowpassDtSensor(SensorEntity, RestoreEntity):
 
         return LowpassExtraData(data)
 
+    # ------------------------------------------------------------
+    # Dynamic naming (first source event only)
+    # ------------------------------------------------------------
+    @callback
+    def _update_name(self) -> None:
+        self._name_pending = False
+
+        st2 = self.hass.states.get(self.cfg.source)
+        if st2 is not None:
+            base2 = (st2.attributes or {}).get("friendly_name")
+            if base2 and not base2.startswith("sensor."):
+                self._attr_name = f"{base2} {self.cfg.suffix}"
+                self.runtime.writer.mark(self)
+
     # ------------------------------------------------------------
     # Handle real source updates
     # ------------------------------------------------------------
     @callback
     def _handle_source_event(self, event: Event) -> None:
 
+        # any state change of the source (not only numeric samples)
+        if self._name_pending:
+            self._update_name()
+
         new_state = event.data.get("new_state")
         if new_state is None:
             return
@@ -403,38 +533,19 @@ class LowpassDtSensor(SensorEntity, RestoreEntity):
         except Exception:
             return
 
-        now = dt_util.utcnow().timestamp()
+        # numeric samples only: the write-reduction base
+        self.publisher.n_events += 1
 
-        # RESET detection (strong drop only)
-        prev_src = self._last_source_value
-        if (self._attr_state_class == "total_increasing" and prev_src is not None and x < prev_src * 0.5 ):
-            _LOGGER.debug("total_increasing RESET detected for source %s dropped from %.6f to %.6f", self.entity_id, prev_src, x)
+        now = sample_time(self, event, new_state)
 
-            # Hard reset of filter state
-            self.core.y = x
-            self.core.last_published = x
-            self.core.err_i = 0.0
-            self.core.t_prev = now
-
-            self._reset_pending = True
-
-        # Update last source value
-        self._last_source_value = x
-
-        # Update dt stats + stop injector
-        self.injector.set_last_source_time(now)
+        # not restored yet: keep the sample for the replay
+        if self._restoring:
+            if self._restore_queue is not None:
+                self._restore_queue.append((now, new_state, x))
+            return
 
-        # Update filter with real measurement
-        dt = self.core.update_from_source(x, now)
+        self._process_sample(new_state, x, now)
 
-        # PASS dt_silence_raw TO PUBLISHER
-        self.publisher.dt_silence = self.injector.dt_silence_raw
+    def _process_sample(self, new_state, x, now) -> None:
 
-        # Publish real measurement
-        self.publisher.publish(
-            new_state,
-            now,
-            dt,
-            force=False,
-            injected=False,
-        )
\ No newline at end of file
+        process_sample(self, new_state, x, now)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from types import MappingProxyType
+
+from homeassistant.components.sensor import SensorEntity
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN
+
+# diagnostic sensors are refreshed on this period, never per event
+STATS_INTERVAL = 60.0
+
+# order of Publisher.counters()
+COUNTERS = (
+    "source_events",
+    "published",
+    "suppressed_deadband",
+    "blocked_max_rate",
+    "injected",
+    "converged",
+    "blocked_monotonic",
+    "outliers",
+)
+
+
+def stats_unique_id(unique_id: str) -> str:
+    """unique_id of the write stats sensor attached to unique_id."""
+    return f"{unique_id}::write_stats"
+
+
+def entry_stats_unique_id(entry_id: str) -> str:
+    return stats_unique_id(f"{DOMAIN}::{entry_id}")
+
+
+# ------------------------------------------------------------
+# Diagnostic sensor: write reduction (%) + raw counters
+# ------------------------------------------------------------
+class LowpassStatsSensor(SensorEntity):
+    """Share of source events that did not cause a state write."""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = "%"
+    _attr_state_class = "measurement"
+    _attr_icon = "mdi:database-arrow-down"
+
+    def __init__(self, unique_id, object_id, name, writer) -> None:
+        self._attr_unique_id = unique_id
+        self._attr_suggested_object_id = object_id
+        self._attr_name = name
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
+
+        self._writer = writer
+        self._key = None
+        self._removed = False
+
+    @callback
+    def set_counters(self, counters, **extra) -> None:
+        key = (counters, extra)
+        if key == self._key or self.hass is None or self._removed:
+            return
+        self._key = key
+
+        events = counters[0]
+        published = counters[1]
+        self._attr_native_value = (
+            round(100.0 * (1.0 - published / events), 1) if events else None
+        )
+        self._attr_extra_state_attributes = MappingProxyType({**dict(zip(COUNTERS, counters)), **extra})
+        self._writer.mark(self)
+
+    @callback
+    def set_available(self, available: bool) -> None:
+        """Follow the filtered sensor: unavailable while it is removed."""
+        if available == self._attr_available:
+            return
+        self._attr_available = available
+        self._key = None
+
+        if self.hass is not None and not self._removed:
+            self._writer.mark(self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._removed = True
+        self._writer.discard(self)
+
+
+# ------------------------------------------------------------
+# Per-entry aggregation on a low-frequency timer
+# ------------------------------------------------------------
+class WriteStats:
+    """Collect the publisher counters of one entry into diagnostic sensors.
+
+    The hot path only increments integer slots. Every STATS_INTERVAL the
+    counters of all filtered sensors are read, summed into the entry
+    sensor and, with diagnostics: sensor, copied to one sensor per filter.
+    """
+
+    def __init__(self, hass: HomeAssistant, writer, per_sensor: bool = False) -> None:
+        self.hass = hass
+        self.writer = writer
+        self.per_sensor = per_sensor
+
+        # filtered sensor -> its stats sensor (None when per_sensor is off)
+        self._sensors: dict = {}
+
+        # stats sensors of removed filtered sensors (unavailable), by
+        # unique_id: a sensor added again gets its stats sensor back
+        self._detached: dict = {}
+        self._entry_sensor = None
+        self._add_entities = None
+        self._own_entity_ids = None
+        self._unsub = None
+
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
+    @callback
+    def start(self, entry_id, async_add_entities, own_entity_ids) -> None:
+        """Create the entry sensor and start the refresh timer."""
+        self._add_entities = async_add_entities
+        self._own_entity_ids = own_entity_ids
+
+        self._entry_sensor = LowpassStatsSensor(
+            entry_stats_unique_id(entry_id),
+            f"{DOMAIN}_write_stats",
+            "Low-pass dt write stats",
+            self.writer,
+        )
+        self._add(self._entry_sensor)
+
+        self._unsub = async_track_time_interval(
+            self.hass,
+            self._refresh,
+            timedelta(seconds=STATS_INTERVAL),
+        )
+
+    @callback
+    def stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._sensors.clear()
+        self._detached.clear()
+
+    def _add(self, ent) -> None:
+        self._add_entities([ent])
+
+        # never picked up as a pattern source (recursion guard)
+        self._own_entity_ids.add(f"sensor.{ent._attr_suggested_object_id}")
+
+    # ------------------------------------------------------------
+    # Filtered sensors
+    # ------------------------------------------------------------
+    @callback
+    def add(self, sensor) -> None:
+        if sensor in self._sensors:
+            return
+
+        ent = None
+        if self.per_sensor and self._add_entities is not None:
+            ent = self._detached.pop(stats_unique_id(sensor.unique_id), None)
+            if ent is not None and not ent._removed:
+                ent.set_available(True)
+                self._sensors[sensor] = ent
+                return
+
+            ent = LowpassStatsSensor(
+                stats_unique_id(sensor.unique_id),
+                f"{sensor._attr_suggested_object_id}_write_stats",
+                f"{sensor.name} write stats",
+                self.writer,
+            )
+            self._add(ent)
+
+        self._sensors[sensor] = ent
+
+    @callback
+    def discard(self, sensor) -> None:
+        ent = self._sensors.pop(sensor, None)
+        if ent is None or ent._removed:
+            return
+
+        # the registry entry stays (cleanup removes it with its filter)
+        ent.set_available(False)
+        self._detached[ent.unique_id] = ent
+
+    # ------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------
+    @callback
+    def _refresh(self, _now=None) -> None:
+        totals = [0] * len(COUNTERS)
+
+        for sensor, ent in self._sensors.items():
+            counters = sensor.publisher.counters()
+            for i, n in enumerate(counters):
+                totals[i] += n
+            if ent is not None:
+                ent.set_counters(counters)
+
+        if self._entry_sensor is not None:
+            self._entry_sensor.set_counters(tuple(totals), sensors=len(self._sensors))
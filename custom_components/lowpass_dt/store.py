@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import base64
+import logging
+import math
+import sys
+from array import array
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# first change after a save schedules the next one this much later
+SAVE_DELAY = 60.0
+
+# persisted filter state: (restore group, key, owner, attribute)
+FIELDS = (
+    ("low_pass", "y", "core", "y"),
+    ("low_pass", "t_prev", "core", "t_prev"),
+    ("low_pass", "v", "core", "v"),
+    ("kalman", "p", "core", "kp"),
+    ("kalman", "q", "core", "kq"),
+    ("kalman", "r", "core", "kr"),
+    ("low_pass", "time_last_pub", "core", "time_last_pub"),
+    ("low_pass", "err_i", "core", "err_i"),
+    ("low_pass", "last_published", "core", "last_published"),
+    ("ema_source", "src_mean", "core", "src_mean"),
+    ("ema_source", "src_m2", "core", "src_m2"),
+    ("ema_source", "t_sigma_start", "core", "t_sigma_start"),
+    ("ema_dt_source", "dt_mean", "injector", "dt_mean"),
+    ("ema_dt_source", "dt_m2", "injector", "dt_m2"),
+    ("ema_dt_source", "t_last_source", "injector", "t_last_source"),
+    ("ema_dt_output", "dt_output_mean", "publisher", "dt_output_mean"),
+    ("ema_dt_output", "dt_output_m2", "publisher", "dt_output_m2"),
+)
+
+_FIELD_NAMES = tuple(f"{group}.{key}" for group, key, _owner, _attr in FIELDS)
+
+
+def _export_row(sensor):
+    row = []
+    for _group, _key, owner, attr in FIELDS:
+        v = getattr(getattr(sensor, owner), attr)
+        row.append(math.nan if v is None else float(v))
+    return row
+
+
+def _pack(unique_ids, rows):
+    """Column-major float64 blob: all values of field 0, then field 1, ..."""
+    values = array("d")
+    for j in range(len(FIELDS)):
+        values.extend(row[j] for row in rows)
+
+    return {
+        "unique_ids": unique_ids,
+        "fields": list(_FIELD_NAMES),
+        "byteorder": sys.byteorder,
+        "values": base64.b64encode(values.tobytes()).decode("ascii"),
+    }
+
+
+def _unpack(data):
+    """Return {unique_id: row} in FIELDS order (NaN for unknown fields)."""
+    unique_ids = data["unique_ids"]
+    n = len(unique_ids)
+
+    values = array("d")
+    values.frombytes(base64.b64decode(data["values"]))
+    if data.get("byteorder", sys.byteorder) != sys.byteorder:
+        values.byteswap()
+
+    saved = {name: j for j, name in enumerate(data["fields"])}
+    if len(values) != n * len(saved):
+        raise ValueError(f"{len(values)} values for {n} rows x {len(saved)} fields")
+
+    columns = [saved.get(name) for name in _FIELD_NAMES]
+    return {
+        uid: [math.nan if j is None else values[j * n + i] for j in columns]
+        for i, uid in enumerate(unique_ids)
+    }
+
+
+class FilterStore:
+    """Filter state of one config entry, persisted as a single Store file.
+
+    Replaces the per-entity extra restore data: loaded once at setup,
+    written as packed float64 columns indexed by unique_id. The first
+    change (source sample or injection step) after a save schedules a
+    delayed save; Store flushes a pending save at shutdown, and entry
+    unload awaits a final save so that a reload reads the latest state.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+        # unique_id -> sensor (live) / row (loaded, not yet re-added)
+        self._sensors: dict = {}
+        self._rows: dict = {}
+        self._save_pending = False
+        self._stopped = False
+
+    # ------------------------------------------------------------
+    # Load (setup)
+    # ------------------------------------------------------------
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        if not data:
+            return
+
+        try:
+            self._rows = _unpack(data)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring unreadable filter state store: %s", err)
+            self._rows = {}
+
+    @callback
+    def prune(self, keep) -> None:
+        """Drop the loaded state of unique_ids that are no longer configured."""
+        stale = [uid for uid in self._rows if uid not in keep]
+        for uid in stale:
+            del self._rows[uid]
+
+        if stale:
+            _LOGGER.debug("dropped filter state of %d unconfigured sensors", len(stale))
+            self.touch()
+
+    def get(self, unique_id) -> dict | None:
+        """Restore dict (extra restore data layout) of unique_id, or None."""
+        row = self._rows.get(unique_id)
+        if row is None:
+            return None
+
+        data = {}
+        for (group, key, _owner, _attr), v in zip(FIELDS, row):
+            data.setdefault(group, {})[key] = None if math.isnan(v) else v
+        return data
+
+    # ------------------------------------------------------------
+    # Live sensors
+    # ------------------------------------------------------------
+    @callback
+    def add(self, sensor) -> None:
+        self._sensors[sensor.unique_id] = sensor
+        self._rows.pop(sensor.unique_id, None)
+
+    @callback
+    def remove(self, sensor) -> None:
+        """Keep the last state of a removed sensor (entry reload)."""
+        if self._sensors.pop(sensor.unique_id, None) is not None:
+            self._rows[sensor.unique_id] = _export_row(sensor)
+
+    @callback
+    def forget(self, unique_id) -> None:
+        """Drop the state of a deleted entity."""
+        self._sensors.pop(unique_id, None)
+        if self._rows.pop(unique_id, None) is not None:
+            self.touch()
+
+    # ------------------------------------------------------------
+    # Save
+    # ------------------------------------------------------------
+    @callback
+    def touch(self) -> None:
+        """Filter state changed: make sure a save is scheduled."""
+        if not self._save_pending and not self._stopped:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        self._save_pending = False
+
+        unique_ids = list(self._rows)
+        rows = list(self._rows.values())
+        for uid, sensor in self._sensors.items():
+            unique_ids.append(uid)
+            rows.append(_export_row(sensor))
+
+        return _pack(unique_ids, rows)
+
+    async def async_stop(self) -> None:
+        """Write now and wait for it (entry unload, before a reload loads)."""
+        self._stopped = True
+        await self._store.async_save(self._data_to_save())
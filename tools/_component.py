@@ -0,0 +1,17 @@
+"""Import the lowpass_dt modules that do not need Home Assistant.
+
+The integration package __init__ imports Home Assistant, so offline tools
+register a bare `lowpass_dt` package pointing at the component directory
+and import the pure modules (filter, publisher, injector, ...) from it.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+COMPONENT_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "lowpass_dt"
+
+if "lowpass_dt" not in sys.modules:
+    _pkg = types.ModuleType("lowpass_dt")
+    _pkg.__path__ = [str(COMPONENT_DIR)]
+    sys.modules["lowpass_dt"] = _pkg
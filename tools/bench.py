@@ -0,0 +1,455 @@
+"""Throughput benchmarks of the lowpass_dt hot paths.
+
+Times LowpassCore.update_from_source, LowpassCore.should_publish,
+Publisher.publish (against a stub entity), the injection step of silent
+sensors (scalar update_synthetic, and the NumPy update_many baseline of
+vectorized.py, checked to give the same state) and the loader pattern
+matching on synthetic irregular traces at several sensor counts, measures the
+memory of the per-sensor filter state (cfg, LowpassCore, Publisher,
+TauInjector and its wheel timers), and writes the results as JSON so
+events/second and bytes/sensor can be compared across releases.
+
+Memory is reported for the shipped layout ("slots") and for a "dict"
+baseline: the same classes rebuilt without __slots__ and one CoreParams
+block per core instead of the shared one.
+
+    python tools/bench.py --output bench.json
+    python tools/bench.py --sizes 10,100 --traces irregular,angle --repeat 1
+"""
+
+import argparse
+import dataclasses
+import fnmatch
+import gc
+import json
+import logging
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import _component  # noqa: F401  (registers the lowpass_dt package)
+from simloop import SimLoop
+from traces import TRACE_KINDS, interleave
+
+from lowpass_dt.config import LowpassCfg, build_cfg
+from lowpass_dt.filter import LowpassCore, _shared_params, compile_params
+from lowpass_dt.injector import TauInjector
+from lowpass_dt.matcher import PatternMatcher
+from lowpass_dt.publisher import Publisher
+from lowpass_dt.scheduler import TimerWheel
+
+try:
+    from vectorized import update_many
+except ImportError:  # NumPy not installed: no vectorized baseline
+    update_many = None
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+MEMORY_LAYOUTS = ("slots", "dict")
+
+ENGINES = ("lowpass", "critical", "butterworth", "kalman")
+
+# the vectorized baseline must reproduce the scalar step up to rounding
+VECTOR_TOLERANCE = 1e-9
+
+
+# ------------------------------------------------------------
+# Stub entity (only what Publisher.publish touches)
+# ------------------------------------------------------------
+def _write_now(entity):
+    # no event loop here: the coalesced write happens immediately
+    entity.async_write_ha_state()
+
+
+class BenchEntity:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.entity_id = f"sensor.{cfg.prefix}{cfg.source.split('.', 1)[1]}"
+        self._unique_id_seed = self.entity_id
+        self.runtime = SimpleNamespace(budget=None, writer=SimpleNamespace(mark=_write_now))
+        self.injector = SimpleNamespace(source_just_resumed=False, silent=False)
+
+        self._attr_native_unit_of_measurement = None
+        self._attr_icon = None
+        self._attr_device_class = None
+        self._attr_state_class = None
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
+
+        self._last_source_value = None
+        self._reset_pending = False
+        self.writes = 0
+
+        self.core = LowpassCore(cfg)
+        self.publisher = Publisher(self, cfg, self.core)
+
+    def async_write_ha_state(self):
+        self.writes += 1
+
+
+def _item_for(kind):
+    if kind == "angle":
+        return {"tau": 30.0, "circular": 360}
+    if kind == "counter":
+        return {"tau": 300.0}
+    return {"tau": 60.0}
+
+
+def _attrs_for(kind):
+    if kind == "counter":
+        return {"unit_of_measurement": "kWh", "device_class": "energy", "state_class": "total_increasing"}
+    if kind == "angle":
+        return {"unit_of_measurement": "°"}
+    return {"unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}
+
+
+# ------------------------------------------------------------
+# Individual benchmarks: return elapsed seconds
+# ------------------------------------------------------------
+def bench_update(cfgs, events):
+    cores = [LowpassCore(cfg) for cfg in cfgs]
+    t0 = time.perf_counter()
+    for t, i, x in events:
+        cores[i].update_from_source(x, t)
+    return time.perf_counter() - t0
+
+
+def bench_should_publish(cfgs, events):
+    # decisions only make sense on live state: time update + decision,
+    # then subtract the update-only time of the same trace
+    cores = [LowpassCore(cfg) for cfg in cfgs]
+    t0 = time.perf_counter()
+    for t, i, x in events:
+        core = cores[i]
+        core.update_from_source(x, t)
+        if core.should_publish(t):
+            core.finalize_publish(t)
+    elapsed = time.perf_counter() - t0
+
+    return max(elapsed - bench_update(cfgs, events), 1e-9)
+
+
+def bench_publish(cfgs, events, attrs):
+    # includes the core update each publish decision depends on
+    entities = [BenchEntity(cfg) for cfg in cfgs]
+    src = SimpleNamespace(state=None, attributes=attrs)
+
+    t0 = time.perf_counter()
+    for t, i, x in events:
+        ent = entities[i]
+        ent._last_source_value = x
+        dt = ent.core.update_from_source(x, t)
+        ent.publisher.publish(src, t, dt, force=False, injected=False)
+    return time.perf_counter() - t0
+
+
+def _silent_cores(kind, sensors, events, engine):
+    """Cores warmed up on the trace, then left silent at their last sample."""
+    item = dict(_item_for(kind), filter=engine)
+    cores = [LowpassCore(build_cfg(item, source=f"sensor.{kind}_{i}")) for i in range(sensors)]
+    last = [0.0] * sensors
+    for t, i, x in events:
+        cores[i].update_from_source(x, t)
+        last[i] = x
+    return cores, last
+
+
+def bench_inject(kind, sensors, events, engine, ticks, vectorized):
+    cores, last = _silent_cores(kind, sensors, events, engine)
+    t_end = events[-1][0]
+
+    t0 = time.perf_counter()
+    for k in range(1, ticks + 1):
+        now = t_end + k
+        if vectorized:
+            update_many(cores, last, [now] * sensors)
+        else:
+            for core, x in zip(cores, last):
+                core.update_synthetic(x, now)
+    return time.perf_counter() - t0
+
+
+def check_update_many(kind, sensors, events, engine, ticks=5):
+    """Max difference of y, v and kp between update_many and the scalar step."""
+    scalar, last = _silent_cores(kind, sensors, events, engine)
+    vector, _ = _silent_cores(kind, sensors, events, engine)
+    t_end = events[-1][0]
+
+    worst = 0.0
+    for k in range(1, ticks + 1):
+        # irregular tick spacing, partly beyond tau (dt clamping)
+        now = t_end + k * k * 7.5
+        dts = [core.update_synthetic(x, now) for core, x in zip(scalar, last)]
+        dts_many = update_many(vector, last, [now] * sensors)
+
+        for a, b, dt, dt_many in zip(scalar, vector, dts, dts_many):
+            p = a._p
+            dy = a.y - b.y
+            if p.circular is not None:
+                dy = ((dy + p.half) % p.circular) - p.half
+            worst = max(worst, abs(dy), abs(a.v - b.v), abs(a.kp - b.kp), abs(dt - dt_many))
+
+    return worst
+
+
+def _entity_universe(sensors, seed=0):
+    rng = random.Random(seed)
+    kinds = ("temperature", "humidity", "power", "energy", "battery", "rssi", "lux", "voltage")
+    return [f"sensor.{rng.choice(kinds)}_{rng.choice(('kitchen', 'garage', 'room', 'plug'))}_{i}" for i in range(sensors)]
+
+
+_PATTERNS = [
+    "sensor.temperature_*",
+    "sensor.humidity_room_*",
+    "sensor.*_plug_*",
+    "sensor.power_garage_?",
+    "sensor.lux_[kg]*",
+    "binary_sensor.*",
+    "sensor.voltage_kitchen_1*",
+    "sensor.energy_*_9",
+]
+
+
+def bench_match(sensors, n_events, seed=0):
+    ids = _entity_universe(sensors, seed)
+    rng = random.Random(seed + 1)
+    stream = [rng.choice(ids) for _ in range(n_events)]
+    matcher = PatternMatcher(_PATTERNS)
+
+    t0 = time.perf_counter()
+    for eid in stream:
+        matcher.match(eid)
+    return time.perf_counter() - t0
+
+
+def bench_fnmatch_baseline(sensors, n_events, seed=0):
+    ids = _entity_universe(sensors, seed)
+    rng = random.Random(seed + 1)
+    stream = [rng.choice(ids) for _ in range(n_events)]
+
+    t0 = time.perf_counter()
+    for eid in stream:
+        for pat in _PATTERNS:
+            if fnmatch.fnmatch(eid, pat):
+                break
+    return time.perf_counter() - t0
+
+
+# ------------------------------------------------------------
+# Memory baseline: the same classes with a per-instance __dict__
+# ------------------------------------------------------------
+def _dict_class(cls):
+    """cls rebuilt without __slots__ (same methods, attributes in __dict__)."""
+    slots = set(getattr(cls, "__slots__", ()))
+    namespace = {
+        name: value
+        for name, value in vars(cls).items()
+        if name not in slots and name not in ("__slots__", "__dict__", "__weakref__")
+    }
+    return type(f"{cls.__name__}Dict", cls.__bases__, namespace)
+
+
+_DICT_CLASSES = {}
+
+
+def _layout_classes(layout):
+    """(cfg, core, publisher, injector) classes of a memory layout."""
+    classes = (LowpassCfg, LowpassCore, Publisher, TauInjector)
+    if layout == "slots":
+        return classes
+    if not _DICT_CLASSES:
+        _DICT_CLASSES.update((cls, _dict_class(cls)) for cls in classes)
+    return tuple(_DICT_CLASSES[cls] for cls in classes)
+
+
+def bench_memory(kind, sensors, events, layout="slots"):
+    """Bytes per filtered sensor: cfg + core + publisher + injector, warmed up."""
+    cfg_cls, core_cls, publisher_cls, injector_cls = _layout_classes(layout)
+
+    loop = SimLoop(events[0][0] if events else 0.0)
+    wheel = TimerWheel(loop, clock=loop.time)
+    hass = SimpleNamespace(loop=loop)
+    owner = SimpleNamespace()
+    item = _item_for(kind)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    stacks = []
+    for i in range(sensors):
+        cfg = build_cfg(item, source=f"sensor.{kind}_{i}")
+        if cfg_cls is not LowpassCfg:
+            cfg = cfg_cls(**{f.name: getattr(cfg, f.name) for f in dataclasses.fields(cfg)})
+
+        core = core_cls(cfg)
+        if layout == "dict":
+            # one parameter block per core instead of the shared one
+            _shared_params.cache_clear()
+            core._p = compile_params(cfg)
+
+        stacks.append((
+            core,
+            publisher_cls(owner, cfg, core),
+            injector_cls(hass, cfg, core, None, None, wheel),
+        ))
+
+    # populate every state field (floats, stats, armed timers)
+    for t, i, x in events:
+        core, publisher, injector = stacks[i]
+        dt = core.update_from_source(x, t)
+        injector.set_last_source_time(t)
+        if core.should_publish(t):
+            core.finalize_publish(t)
+        publisher.dt_silence = injector.dt_silence_raw
+        publisher._update_dt_output_stats(dt)
+
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    wheel.stop()
+    return used / sensors
+
+
+# ------------------------------------------------------------
+# Runner
+# ------------------------------------------------------------
+def _best_of(repeat, fn, *args):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        elapsed = fn(*args)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(sizes, kinds, *, events_budget, repeat, seed=0):
+    results = []
+
+    def record(name, sensors, kind, n_events, seconds):
+        results.append({
+            "bench": name,
+            "sensors": sensors,
+            "trace": kind,
+            "events": n_events,
+            "seconds": seconds,
+            "events_per_sec": n_events / seconds if seconds > 0 else None,
+        })
+
+    for sensors in sizes:
+        per_sensor = max(5, events_budget // sensors)
+
+        for kind in kinds:
+            cfgs = [
+                build_cfg(_item_for(kind), source=f"sensor.{kind}_{i}")
+                for i in range(sensors)
+            ]
+            events = interleave(kind, sensors, per_sensor, seed=seed)
+            n = len(events)
+
+            record("core.update_from_source", sensors, kind, n, _best_of(repeat, bench_update, cfgs, events))
+            record("core.should_publish", sensors, kind, n, _best_of(repeat, bench_should_publish, cfgs, events))
+            record("publisher.publish", sensors, kind, n, _best_of(repeat, bench_publish, cfgs, events, _attrs_for(kind)))
+
+            ticks = max(5, events_budget // sensors // 10)
+            for engine in ENGINES:
+                seconds = _best_of(repeat, bench_inject, kind, sensors, events, engine, ticks, False)
+                record("injector.update_synthetic", sensors, kind, ticks * sensors, seconds)
+                results[-1]["engine"] = engine
+
+                if update_many is None:
+                    continue
+
+                seconds = _best_of(repeat, bench_inject, kind, sensors, events, engine, ticks, True)
+                record("injector.update_many_baseline", sensors, kind, ticks * sensors, seconds)
+                results[-1]["engine"] = engine
+
+                results.append({
+                    "bench": "injector.update_many_check",
+                    "engine": engine,
+                    "sensors": sensors,
+                    "trace": kind,
+                    "max_abs_error": check_update_many(kind, sensors, events, engine),
+                })
+
+            for layout in MEMORY_LAYOUTS:
+                results.append({
+                    "bench": "memory.per_sensor",
+                    "layout": layout,
+                    "sensors": sensors,
+                    "trace": kind,
+                    "events": n,
+                    "bytes_per_sensor": bench_memory(kind, sensors, events, layout),
+                })
+
+        n = max(events_budget, sensors)
+        record("loader.match", sensors, None, n, _best_of(repeat, bench_match, sensors, n, seed))
+        record("loader.fnmatch_baseline", sensors, None, n, _best_of(repeat, bench_fnmatch_baseline, sensors, n, seed))
+
+    return results
+
+
+def _ints(text):
+    return [int(v) for v in text.split(",") if v.strip()]
+
+
+def _kinds(text):
+    kinds = [v.strip() for v in text.split(",") if v.strip()]
+    for kind in kinds:
+        if kind not in TRACE_KINDS:
+            raise argparse.ArgumentTypeError(f"unknown trace {kind!r}, expected {TRACE_KINDS}")
+    return kinds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=_ints, default=list(DEFAULT_SIZES), help="sensor counts")
+    parser.add_argument("--traces", type=_kinds, default=list(TRACE_KINDS), help="trace kinds")
+    parser.add_argument("--events", type=int, default=100_000, help="events per (size, trace) run")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    # integration warnings (rate limiter, monotonicity) are expected here
+    logging.basicConfig(level=logging.CRITICAL)
+
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "events_budget": args.events,
+            "repeat": args.repeat,
+        },
+        "results": run(args.sizes, args.traces, events_budget=args.events, repeat=args.repeat, seed=args.seed),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+    mismatches = [
+        r for r in report["results"]
+        if r["bench"] == "injector.update_many_check" and not r["max_abs_error"] <= VECTOR_TOLERANCE
+    ]
+    if mismatches:
+        for r in mismatches:
+            print(
+                f"update_many differs from update_synthetic: {r['engine']} {r['trace']} "
+                f"x{r['sensors']} max_abs_error={r['max_abs_error']:.3g}",
+                file=sys.stderr,
+            )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,797 @@
+"""Minimal in-process stand-in for Home Assistant, on a virtual clock.
+
+Provides just enough of hass.states, the event bus, the entity registry,
+async_call_later / async_track_time_interval / async_track_state_change_event,
+RestoreEntity and SensorEntity.async_write_ha_state to run the real
+lowpass_dt loader and sensor code without Home Assistant installed and
+without any network.
+
+    from fakehass import FakeHarness
+
+    harness = FakeHarness()
+    harness.set_state("sensor.power", 120.0, {"unit_of_measurement": "W"})
+    harness.setup_entry({"sensors": [{"source": "sensor.power"}]})
+    harness.start()
+    harness.advance(10)
+    harness.set_state("sensor.power", 125.0, {"unit_of_measurement": "W"})
+
+install() must run before the integration is imported; FakeHarness does it.
+"""
+
+import enum
+import json
+import sys
+import threading
+import types
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from simloop import SimLoop
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+EVENT_STATE_CHANGED = "state_changed"
+EVENT_HOMEASSISTANT_STARTED = "homeassistant_started"
+EVENT_ENTITY_REGISTRY_UPDATED = "entity_registry_updated"
+
+
+class EntityCategory(enum.StrEnum):
+    CONFIG = "config"
+    DIAGNOSTIC = "diagnostic"
+
+
+# ------------------------------------------------------------
+# homeassistant.core
+# ------------------------------------------------------------
+def callback(func):
+    func._hass_callback = True
+    return func
+
+
+class CoreState(enum.Enum):
+    not_running = "NOT_RUNNING"
+    starting = "STARTING"
+    running = "RUNNING"
+    stopping = "STOPPING"
+
+
+class ReadOnlyDict(dict):
+    """Attributes mapping (HA reuses it when attributes do not change)."""
+
+
+class Event:
+    __slots__ = ("event_type", "data", "time_fired_timestamp")
+
+    def __init__(self, event_type, data, time_fired_timestamp):
+        self.event_type = event_type
+        self.data = data
+        self.time_fired_timestamp = time_fired_timestamp
+
+
+class State:
+    __slots__ = ("entity_id", "state", "attributes", "last_updated_timestamp", "last_changed_timestamp")
+
+    def __init__(self, entity_id, state, attributes, timestamp, last_changed_timestamp=None):
+        self.entity_id = entity_id
+        self.state = state
+        self.attributes = attributes
+        self.last_updated_timestamp = timestamp
+        self.last_changed_timestamp = timestamp if last_changed_timestamp is None else last_changed_timestamp
+
+    @property
+    def domain(self):
+        return self.entity_id.split(".", 1)[0]
+
+    @property
+    def last_updated(self):
+        return datetime.fromtimestamp(self.last_updated_timestamp, timezone.utc)
+
+    @property
+    def last_changed(self):
+        return datetime.fromtimestamp(self.last_changed_timestamp, timezone.utc)
+
+
+class EventBus:
+    def __init__(self, hass):
+        self._hass = hass
+        self._listeners = {}
+        self.fired = 0
+
+    def async_listen(self, event_type, listener, event_filter=None, **_kwargs):
+        entry = (listener, event_filter)
+        self._listeners.setdefault(event_type, []).append(entry)
+
+        def _unsub():
+            listeners = self._listeners.get(event_type, [])
+            if entry in listeners:
+                listeners.remove(entry)
+
+        return _unsub
+
+    def async_listen_once(self, event_type, listener):
+        unsub = None
+
+        def _once(event):
+            unsub()
+            return listener(event)
+
+        unsub = self.async_listen(event_type, _once)
+        return unsub
+
+    def async_fire(self, event_type, data=None):
+        self.fired += 1
+        event = Event(event_type, data or {}, self._hass.clock())
+        for listener, event_filter in tuple(self._listeners.get(event_type, ())):
+            if event_filter is not None and not event_filter(event.data):
+                continue
+            self._hass.async_run_job(listener, event)
+
+
+class StateMachine:
+    def __init__(self, hass):
+        self._hass = hass
+        self._states = {}
+
+    def get(self, entity_id):
+        return self._states.get(entity_id)
+
+    def async_all(self, domain=None):
+        if domain is None:
+            return list(self._states.values())
+        prefix = f"{domain}."
+        return [st for eid, st in self._states.items() if eid.startswith(prefix)]
+
+    def async_set(self, entity_id, new_state, attributes=None, force_update=False):
+        now = self._hass.clock()
+        old = self._states.get(entity_id)
+        new_state = str(new_state)
+        attributes = attributes or {}
+
+        same_state = old is not None and old.state == new_state
+        same_attrs = old is not None and old.attributes == attributes
+
+        if same_state and same_attrs and not force_update:
+            return False
+
+        attrs = old.attributes if same_attrs else ReadOnlyDict(attributes)
+        last_changed = old.last_changed_timestamp if same_state else now
+        state = State(entity_id, new_state, attrs, now, last_changed)
+        self._states[entity_id] = state
+        if self._hass.recorder is not None:
+            self._hass.recorder.record(state)
+
+        self._hass.bus.async_fire(
+            EVENT_STATE_CHANGED,
+            {"entity_id": entity_id, "old_state": old, "new_state": state},
+        )
+        return True
+
+    def async_remove(self, entity_id):
+        old = self._states.pop(entity_id, None)
+        if old is not None:
+            self._hass.bus.async_fire(
+                EVENT_STATE_CHANGED,
+                {"entity_id": entity_id, "old_state": old, "new_state": None},
+            )
+
+
+def _drive(coro):
+    """Run a coroutine that never really suspends (all fakes are immediate)."""
+    try:
+        while True:
+            coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+
+
+# ------------------------------------------------------------
+# homeassistant.helpers.storage (JSON round trip into hass.storage)
+# ------------------------------------------------------------
+class Store:
+    def __init__(self, hass, version, key, **_kwargs):
+        self.hass = hass
+        self.version = version
+        self.key = key
+        self.saves = 0
+        self._data_func = None
+        self._handle = None
+        hass.stores.append(self)
+
+    async def async_load(self):
+        raw = self.hass.storage.get(self.key)
+        return None if raw is None else json.loads(raw)["data"]
+
+    async def async_save(self, data):
+        self._cancel()
+        self._write(data)
+
+    def async_delay_save(self, data_func, delay=0):
+        self._cancel()
+        self._data_func = data_func
+        self._handle = self.hass.loop.call_later(delay, self._delayed_write)
+
+    def _cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._data_func = None
+
+    def _delayed_write(self):
+        data_func = self._data_func
+        self._handle = None
+        self._data_func = None
+        self._write(data_func())
+
+    def _write(self, data):
+        self.saves += 1
+        self.hass.storage[self.key] = json.dumps({"version": self.version, "key": self.key, "data": data})
+
+    def final_write(self):
+        """Flush a pending delayed save (EVENT_HOMEASSISTANT_FINAL_WRITE)."""
+        if self._data_func is not None:
+            data_func = self._data_func
+            self._cancel()
+            self._write(data_func())
+
+
+# ------------------------------------------------------------
+# homeassistant.components.recorder (history only)
+# ------------------------------------------------------------
+class Recorder:
+    def __init__(self, hass):
+        self._hass = hass
+        self.history = {}
+        self.queries = 0
+        self.windows = []
+
+    def record(self, state):
+        self.history.setdefault(state.entity_id, []).append(state)
+
+    async def async_add_executor_job(self, target, *args):
+        return target(*args)
+
+
+def _recorder_get_instance(hass):
+    return hass.recorder
+
+
+def _compressed_rows(states):
+    """minimal_response + compressed_state_format rows (unchanged states skipped)."""
+    rows = []
+    prev = None
+    for st in states:
+        if not rows:
+            rows.append({"s": st.state, "a": {}, "lu": st.last_updated_timestamp})
+        elif st.state != prev:
+            rows.append({"s": st.state, "lu": st.last_updated_timestamp})
+        prev = st.state
+    return rows
+
+
+def get_significant_states(hass, start_time, end_time=None, entity_ids=None, *,
+                           minimal_response=False, compressed_state_format=False, **_kwargs):
+    recorder = hass.recorder
+    recorder.queries += 1
+    recorder.windows.append(((end_time or start_time) - start_time).total_seconds())
+    t0 = start_time.timestamp()
+    t1 = end_time.timestamp() if end_time is not None else float("inf")
+    result = {
+        eid: [st for st in recorder.history.get(eid, ()) if t0 <= st.last_updated_timestamp < t1]
+        for eid in entity_ids or recorder.history
+    }
+    if minimal_response and compressed_state_format:
+        result = {eid: _compressed_rows(states) for eid, states in result.items()}
+    return result
+
+
+class HomeAssistant:
+    def __init__(self, start=1.7e9):
+        self.loop = SimLoop(start)
+        self.loop_thread_id = threading.get_ident()
+        self.data = {}
+        self.entities = {}
+        self.state = CoreState.not_running
+        self.bus = EventBus(self)
+        self.states = StateMachine(self)
+        self.entity_registry = EntityRegistry(self)
+        self.restore_cache = {}
+        self.storage = {}
+        self.stores = []
+        self.config = types.SimpleNamespace(components=set())
+        self.recorder = None
+
+    def enable_recorder(self):
+        """Load the fake recorder: every state set from now on is recorded."""
+        self.recorder = Recorder(self)
+        self.config.components.add("recorder")
+        return self.recorder
+
+    def clock(self):
+        return self.loop.time()
+
+    def async_run_job(self, target, *args):
+        result = target(*args)
+        if hasattr(result, "send"):
+            return _drive(result)
+        return result
+
+    def async_create_task(self, coro, *_args, **_kwargs):
+        return _drive(coro)
+
+    def async_create_background_task(self, coro, *_args, **_kwargs):
+        return _drive(coro)
+
+    async def async_add_executor_job(self, target, *args):
+        return target(*args)
+
+
+# ------------------------------------------------------------
+# homeassistant.config_entries
+# ------------------------------------------------------------
+class ConfigEntry:
+    def __init__(self, entry_id, data):
+        self.entry_id = entry_id
+        self.data = data
+        self._on_unload = []
+
+    def async_on_unload(self, func):
+        self._on_unload.append(func)
+
+    def unload(self):
+        while self._on_unload:
+            self._on_unload.pop()()
+
+
+class ConfigFlow:
+    def __init_subclass__(cls, domain=None, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.domain = domain
+
+
+# ------------------------------------------------------------
+# homeassistant.helpers.entity_registry
+# ------------------------------------------------------------
+class RegistryEntry:
+    __slots__ = ("entity_id", "unique_id", "platform", "domain", "config_entry_id")
+
+    def __init__(self, entity_id, unique_id, platform, config_entry_id):
+        self.entity_id = entity_id
+        self.unique_id = unique_id
+        self.platform = platform
+        self.domain = entity_id.split(".", 1)[0]
+        self.config_entry_id = config_entry_id
+
+
+class EntityRegistry:
+    def __init__(self, hass):
+        self._hass = hass
+        self.entities = {}
+        self._by_unique_id = {}
+
+    def async_get(self, entity_id):
+        return self.entities.get(entity_id)
+
+    def async_get_entity_id(self, domain, platform, unique_id):
+        entry = self._by_unique_id.get((domain, platform, unique_id))
+        return entry.entity_id if entry is not None else None
+
+    def async_get_or_create(self, domain, platform, unique_id, *, suggested_object_id=None, config_entry_id=None):
+        key = (domain, platform, unique_id)
+        entry = self._by_unique_id.get(key)
+        if entry is not None:
+            return entry
+
+        object_id = suggested_object_id or str(unique_id).replace(":", "_").replace(".", "_")
+        entity_id = f"{domain}.{object_id}"
+        n = 2
+        while entity_id in self.entities:
+            entity_id = f"{domain}.{object_id}_{n}"
+            n += 1
+
+        entry = RegistryEntry(entity_id, unique_id, platform, config_entry_id)
+        self.entities[entity_id] = entry
+        self._by_unique_id[key] = entry
+
+        self._hass.bus.async_fire(
+            EVENT_ENTITY_REGISTRY_UPDATED,
+            {"action": "create", "entity_id": entity_id},
+        )
+        return entry
+
+    def async_update_entity(self, entity_id, *, new_entity_id=None):
+        entry = self.entities.get(entity_id)
+        if entry is None or new_entity_id is None or new_entity_id in self.entities:
+            return entry
+        del self.entities[entity_id]
+        entry.entity_id = new_entity_id
+        self.entities[new_entity_id] = entry
+
+        self._hass.bus.async_fire(
+            EVENT_ENTITY_REGISTRY_UPDATED,
+            {"action": "update", "entity_id": new_entity_id, "changes": {"entity_id": entity_id}, "old_entity_id": entity_id},
+        )
+
+        # the platform follows the rename, like EntityPlatform does
+        ent = self._hass.entities.pop(entity_id, None)
+        if ent is not None:
+            ent.entity_id = new_entity_id
+            self._hass.entities[new_entity_id] = ent
+            self._hass.states.async_remove(entity_id)
+            ent.async_write_ha_state()
+        return entry
+
+    def async_remove(self, entity_id):
+        entry = self.entities.pop(entity_id, None)
+        if entry is not None:
+            self._by_unique_id.pop((entry.domain, entry.platform, entry.unique_id), None)
+            self._hass.bus.async_fire(
+                EVENT_ENTITY_REGISTRY_UPDATED,
+                {"action": "remove", "entity_id": entity_id},
+            )
+
+
+def _er_async_get(hass):
+    return hass.entity_registry
+
+
+# ------------------------------------------------------------
+# homeassistant.helpers.event
+# ------------------------------------------------------------
+def async_track_state_change_event(hass, entity_ids, action):
+    if isinstance(entity_ids, str):
+        entity_ids = [entity_ids]
+    wanted = set(entity_ids)
+    return hass.bus.async_listen(
+        EVENT_STATE_CHANGED,
+        action,
+        event_filter=lambda data: data["entity_id"] in wanted,
+    )
+
+
+def _utcnow_of(hass):
+    return datetime.fromtimestamp(hass.clock(), timezone.utc)
+
+
+def async_call_later(hass, delay, action):
+    if isinstance(delay, timedelta):
+        delay = delay.total_seconds()
+    handle = hass.loop.call_later(delay, lambda: hass.async_run_job(action, _utcnow_of(hass)))
+    return handle.cancel
+
+
+def async_track_time_interval(hass, action, interval, **_kwargs):
+    seconds = interval.total_seconds()
+    state = {"handle": None}
+
+    def _fire():
+        state["handle"] = hass.loop.call_later(seconds, _fire)
+        hass.async_run_job(action, _utcnow_of(hass))
+
+    state["handle"] = hass.loop.call_later(seconds, _fire)
+    return lambda: state["handle"].cancel()
+
+
+# ------------------------------------------------------------
+# homeassistant.helpers.restore_state / components.sensor
+# ------------------------------------------------------------
+class ExtraStoredData:
+    def as_dict(self):
+        raise NotImplementedError
+
+
+class _StoredExtraData(ExtraStoredData):
+    def __init__(self, data):
+        self._data = data
+
+    def as_dict(self):
+        return self._data
+
+
+class Entity:
+    entity_id = None
+    hass = None
+    platform = None
+    _attr_name = None
+    _attr_unique_id = None
+    _attr_icon = None
+    _attr_should_poll = True
+    _attr_available = True
+    _attr_extra_state_attributes = None
+    _attr_device_class = None
+    _attr_entity_category = None
+
+    writes = 0
+
+    @property
+    def name(self):
+        return self._attr_name
+
+    @property
+    def unique_id(self):
+        return self._attr_unique_id
+
+    @property
+    def extra_state_attributes(self):
+        return self._attr_extra_state_attributes
+
+    def _state_and_attributes(self):
+        attrs = dict(self.extra_state_attributes or {})
+        if self._attr_name:
+            attrs["friendly_name"] = self._attr_name
+        if self._attr_icon:
+            attrs["icon"] = self._attr_icon
+        if self._attr_device_class:
+            attrs["device_class"] = self._attr_device_class
+        return "unknown", attrs
+
+    def async_write_ha_state(self):
+        self.writes += 1
+        state, attrs = self._state_and_attributes()
+        self.hass.states.async_set(self.entity_id, state, attrs)
+
+    async def async_added_to_hass(self):
+        return None
+
+    async def async_will_remove_from_hass(self):
+        return None
+
+
+class SensorEntity(Entity):
+    _attr_native_value = None
+    _attr_native_unit_of_measurement = None
+    _attr_state_class = None
+
+    @property
+    def native_value(self):
+        return self._attr_native_value
+
+    def _state_and_attributes(self):
+        _, attrs = super()._state_and_attributes()
+        if self._attr_native_unit_of_measurement:
+            attrs["unit_of_measurement"] = self._attr_native_unit_of_measurement
+        if self._attr_state_class:
+            attrs["state_class"] = self._attr_state_class
+        if not self._attr_available:
+            return "unavailable", attrs
+        value = self.native_value
+        return ("unknown" if value is None else str(value)), attrs
+
+
+class RestoreEntity(Entity):
+    async def async_get_last_state(self):
+        cached = self.hass.restore_cache.get(self.entity_id)
+        return cached[0] if cached else None
+
+    async def async_get_last_extra_data(self):
+        cached = self.hass.restore_cache.get(self.entity_id)
+        if not cached or cached[1] is None:
+            return None
+        return _StoredExtraData(cached[1])
+
+    @property
+    def extra_restore_state_data(self):
+        return None
+
+    def dump_restore_state(self):
+        """Snapshot (last state, extra data) like RestoreStateData.async_dump_states."""
+        extra = self.extra_restore_state_data
+        return self.hass.states.get(self.entity_id), (extra.as_dict() if extra is not None else None)
+
+
+# ------------------------------------------------------------
+# homeassistant.util.dt
+# ------------------------------------------------------------
+_CURRENT_HASS = []
+
+
+def utcnow():
+    return _utcnow_of(_CURRENT_HASS[-1])
+
+
+# ------------------------------------------------------------
+# Module installation
+# ------------------------------------------------------------
+def _module(name, **attrs):
+    mod = sys.modules.get(name)
+    if mod is None or not getattr(mod, "_lowpass_fake", False):
+        mod = types.ModuleType(name)
+        mod._lowpass_fake = True
+        mod.__path__ = []
+        sys.modules[name] = mod
+    for key, value in attrs.items():
+        setattr(mod, key, value)
+    return mod
+
+
+def install():
+    """Register the fake homeassistant modules in sys.modules."""
+
+    ha = _module("homeassistant")
+    core = _module(
+        "homeassistant.core",
+        HomeAssistant=HomeAssistant,
+        callback=callback,
+        CoreState=CoreState,
+        Event=Event,
+        State=State,
+    )
+    const = _module(
+        "homeassistant.const",
+        EVENT_STATE_CHANGED=EVENT_STATE_CHANGED,
+        EVENT_HOMEASSISTANT_STARTED=EVENT_HOMEASSISTANT_STARTED,
+        EntityCategory=EntityCategory,
+    )
+    config_entries = _module("homeassistant.config_entries", ConfigEntry=ConfigEntry, ConfigFlow=ConfigFlow)
+    helpers = _module("homeassistant.helpers")
+    er = _module(
+        "homeassistant.helpers.entity_registry",
+        async_get=_er_async_get,
+        EVENT_ENTITY_REGISTRY_UPDATED=EVENT_ENTITY_REGISTRY_UPDATED,
+        RegistryEntry=RegistryEntry,
+    )
+    event = _module(
+        "homeassistant.helpers.event",
+        async_track_state_change_event=async_track_state_change_event,
+        async_call_later=async_call_later,
+        async_track_time_interval=async_track_time_interval,
+    )
+    restore_state = _module(
+        "homeassistant.helpers.restore_state",
+        RestoreEntity=RestoreEntity,
+        ExtraStoredData=ExtraStoredData,
+    )
+    typing_mod = _module("homeassistant.helpers.typing", ConfigType=dict)
+    storage = _module("homeassistant.helpers.storage", Store=Store)
+    entity_mod = _module("homeassistant.helpers.entity", Entity=Entity)
+    util = _module("homeassistant.util")
+    dt_mod = _module("homeassistant.util.dt", utcnow=utcnow)
+    components = _module("homeassistant.components")
+    sensor = _module("homeassistant.components.sensor", SensorEntity=SensorEntity)
+    recorder = _module("homeassistant.components.recorder", get_instance=_recorder_get_instance)
+    history = _module("homeassistant.components.recorder.history", get_significant_states=get_significant_states)
+
+    ha.core = core
+    ha.const = const
+    ha.config_entries = config_entries
+    ha.helpers = helpers
+    ha.util = util
+    ha.components = components
+    helpers.entity_registry = er
+    helpers.event = event
+    helpers.restore_state = restore_state
+    helpers.typing = typing_mod
+    helpers.storage = storage
+    helpers.entity = entity_mod
+    util.dt = dt_mod
+    components.sensor = sensor
+    components.recorder = recorder
+    recorder.history = history
+
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+
+
+# ------------------------------------------------------------
+# Harness
+# ------------------------------------------------------------
+class FakeHarness:
+    """Drive the real integration on a FakeHass with a virtual clock."""
+
+    def __init__(self, start=1.7e9):
+        install()
+
+        self.hass = HomeAssistant(start)
+        _CURRENT_HASS.append(self.hass)
+
+        from custom_components.lowpass_dt import const, runtime, sensor
+
+        # run timer wheel deadlines on the virtual clock
+        runtime.wall_clock = self.hass.clock
+
+        self.domain = const.DOMAIN
+        self.sensor_platform = sensor
+        self.entries = []
+        self.entities = []
+        self._entry_entities = {}
+
+        # async_unload_entry unloads the platforms through this
+        self.hass.config_entries = types.SimpleNamespace(async_unload_platforms=self._async_unload_platforms)
+
+    # ------------------------------------------------------------
+    # Sources and time
+    # ------------------------------------------------------------
+    def set_state(self, entity_id, state, attributes=None):
+        return self.hass.states.async_set(entity_id, state, attributes)
+
+    def register_source(self, entity_id, unique_id=None, platform="fake"):
+        """Create a registry entry for a source (pattern mode scans the registry)."""
+        domain, object_id = entity_id.split(".", 1)
+        entry = self.hass.entity_registry.async_get_or_create(
+            domain,
+            platform,
+            unique_id or entity_id,
+            suggested_object_id=object_id,
+        )
+        return entry.entity_id
+
+    def advance(self, seconds):
+        self.hass.loop.run_until(self.hass.clock() + seconds)
+
+    def run_ready(self):
+        self.hass.loop.run_ready()
+
+    @property
+    def now(self):
+        return self.hass.clock()
+
+    # ------------------------------------------------------------
+    # Integration lifecycle
+    # ------------------------------------------------------------
+    def _add_entities(self, entry):
+        registry = self.hass.entity_registry
+
+        def _async_add_entities(entities, update_before_add=False):
+            for ent in entities:
+                ent.hass = self.hass
+                reg_entry = registry.async_get_or_create(
+                    "sensor",
+                    self.domain,
+                    ent.unique_id,
+                    suggested_object_id=getattr(ent, "_attr_suggested_object_id", None),
+                    config_entry_id=entry.entry_id,
+                )
+                ent.entity_id = reg_entry.entity_id
+                self.hass.entities[ent.entity_id] = ent
+                self.entities.append(ent)
+                self._entry_entities.setdefault(entry.entry_id, []).append(ent)
+                _drive(ent.async_added_to_hass())
+
+                # EntityPlatform.add_to_platform_finish writes the state once after the add
+                ent.async_write_ha_state()
+
+        return _async_add_entities
+
+    def setup_entry(self, data, entry_id=None):
+        entry = ConfigEntry(entry_id or f"entry_{len(self.entries) + 1}", data)
+        self.entries.append(entry)
+        _drive(self.sensor_platform.async_setup_entry(self.hass, entry, self._add_entities(entry)))
+        self.run_ready()
+        return entry
+
+    def start(self):
+        """Mark HA as running and fire homeassistant_started."""
+        self.hass.state = CoreState.running
+        self.hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        self.run_ready()
+
+    def final_write(self):
+        """Flush pending Store saves, like HA does at shutdown."""
+        for store in self.hass.stores:
+            store.final_write()
+
+    def dump_restore_state(self):
+        """Store last states + extra data of all entities for a later restart."""
+        for ent in self.entities:
+            if isinstance(ent, RestoreEntity):
+                self.hass.restore_cache[ent.entity_id] = ent.dump_restore_state()
+
+    async def _async_unload_platforms(self, entry, _platforms):
+        """Remove the entities of entry (EntityPlatform.async_reset)."""
+        for ent in self._entry_entities.pop(entry.entry_id, []):
+            await ent.async_will_remove_from_hass()
+            self.hass.entities.pop(ent.entity_id, None)
+            self.entities.remove(ent)
+        return True
+
+    def unload(self):
+        """Unload all entries like ConfigEntries.async_unload (then on_unload callbacks)."""
+        from custom_components.lowpass_dt import async_unload_entry
+
+        for entry in self.entries:
+            _drive(async_unload_entry(self.hass, entry))
+            entry.unload()
+        self.entries.clear()
+
+    @property
+    def writes(self):
+        return sum(ent.writes for ent in self.entities)
@@ -0,0 +1,166 @@
+"""Load test of the real loader / sensor paths on a fake Home Assistant.
+
+Creates N source sensors, sets up one config entry (explicit sensors by
+default, --patterns for pattern mode with one pattern per group of
+MAX_PATTERN_ENTITIES sources) through the integration's own
+async_setup_entry, then replays synthetic irregular traces on a virtual
+clock. Reports setup time, handled events/second, per-event latency
+percentiles (wall time of the synchronous state_changed dispatch, which
+includes filter update, publish decision and state write) and writes.
+
+    python tools/loadtest.py --sensors 5000 --events 200000
+    python tools/loadtest.py --sensors 1000 --patterns --discovery registry
+    python tools/loadtest.py --sensors 1000 --trace silences -p injection=analytic
+"""
+
+import argparse
+import gc
+import json
+import logging
+import time
+
+from fakehass import FakeHarness, install
+from traces import TRACE_KINDS, interleave
+
+install()
+
+from custom_components.lowpass_dt.config import MAX_PATTERN_ENTITIES  # noqa: E402
+
+_ATTRS = {"unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[idx]
+
+
+def _source_id(i):
+    # grouped so that one pattern per group stays under MAX_PATTERN_ENTITIES
+    return f"sensor.src_{i // MAX_PATTERN_ENTITIES}_{i % MAX_PATTERN_ENTITIES}"
+
+
+def _entry_data(sensors, params, *, patterns, discovery, write_budget):
+    if not patterns:
+        data = {"sensors": [{"source": _source_id(i), **params} for i in range(sensors)]}
+    else:
+        groups = (sensors + MAX_PATTERN_ENTITIES - 1) // MAX_PATTERN_ENTITIES
+        data = {"patterns": [{"match": f"sensor.src_{g}_*", **params} for g in range(groups)]}
+        if discovery:
+            data["discovery"] = discovery
+    if write_budget:
+        data["write_budget"] = write_budget
+    return data
+
+
+def run(sensors, events_per_sensor, *, kind="irregular", params=None, patterns=False,
+        discovery=None, write_budget=None, tail=0.0, seed=0):
+    events = interleave(kind, sensors, events_per_sensor, seed=seed)
+    start = events[0][0] - 60.0 if events else 1.7e9
+
+    harness = FakeHarness(start=start)
+    for i in range(sensors):
+        eid = _source_id(i)
+        harness.register_source(eid)
+        harness.set_state(eid, 0.0, _ATTRS)
+
+    data = _entry_data(sensors, params or {}, patterns=patterns, discovery=discovery, write_budget=write_budget)
+
+    t0 = time.perf_counter()
+    harness.setup_entry(data)
+    harness.start()
+    setup_seconds = time.perf_counter() - t0
+    created = len(harness.entities)
+    writes_setup = harness.writes
+
+    latencies = []
+    source_ids = [_source_id(i) for i in range(sensors)]
+    set_state = harness.hass.states.async_set
+    run_until = harness.hass.loop.run_until
+    perf = time.perf_counter
+
+    gc.collect()
+    t_begin = perf()
+    for t, i, x in events:
+        # timers due before this event (wheel ticks, injection, budget drain)
+        run_until(t)
+        t1 = perf()
+        set_state(source_ids[i], round(x, 3), _ATTRS)
+        latencies.append(perf() - t1)
+    if tail > 0:
+        run_until(harness.now + tail)
+    elapsed = perf() - t_begin
+
+    latencies.sort()
+    n = len(events)
+    report = {
+        "sensors": sensors,
+        "trace": kind,
+        "mode": "pattern" if patterns else "explicit",
+        "params": params or {},
+        "entities_created": created,
+        "setup_seconds": setup_seconds,
+        "events": n,
+        "seconds": elapsed,
+        "events_per_sec": n / elapsed if elapsed > 0 else None,
+        "latency_us": {
+            "p50": _percentile(latencies, 0.50) * 1e6 if latencies else None,
+            "p90": _percentile(latencies, 0.90) * 1e6 if latencies else None,
+            "p99": _percentile(latencies, 0.99) * 1e6 if latencies else None,
+            "max": latencies[-1] * 1e6 if latencies else None,
+        },
+        "writes": harness.writes - writes_setup,
+        "writes_per_event": (harness.writes - writes_setup) / n if n else None,
+        "virtual_seconds": harness.now - start,
+        "pending_callbacks": harness.hass.loop.pending,
+    }
+
+    harness.unload()
+    return report
+
+
+def _param(text):
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {text!r}")
+    for conv in (int, float):
+        try:
+            return key.strip(), conv(value)
+        except ValueError:
+            pass
+    return key.strip(), value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sensors", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=100_000, help="total source events")
+    parser.add_argument("--trace", choices=TRACE_KINDS, default="irregular")
+    parser.add_argument("-p", "--param", type=_param, action="append", default=[], help="filter option KEY=VALUE")
+    parser.add_argument("--patterns", action="store_true", help="pattern mode instead of explicit sensors")
+    parser.add_argument("--discovery", choices=("state", "registry"))
+    parser.add_argument("--write-budget", type=float, help="entry write budget (writes/s)")
+    parser.add_argument("--tail", type=float, default=0.0, help="virtual seconds simulated after the last event")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # integration warnings (rate limiter, monotonicity) are expected here
+    logging.basicConfig(level=logging.CRITICAL)
+
+    report = run(
+        args.sensors,
+        max(1, args.events // args.sensors),
+        kind=args.trace,
+        params=dict(args.param),
+        patterns=args.patterns,
+        discovery=args.discovery,
+        write_budget={"rate": args.write_budget} if args.write_budget else None,
+        tail=args.tail,
+        seed=args.seed,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""Replay recorded source history through the lowpass_dt decision logic.
+
+Streams a source history (Home Assistant recorder SQLite database or a
+history CSV export) through LowpassCore + Publisher + TauInjector in
+simulated time and reports how many state writes would have been
+published and how far the published signal is from the source.
+
+    python tools/replay.py --db home-assistant_v2.db --entity sensor.power -p tau=30
+    python tools/replay.py --csv history.csv --entity sensor.power -p deadband_k_sigma=3
+"""
+
+import argparse
+import csv
+import json
+import logging
+import math
+import sqlite3
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import _component  # noqa: F401  (registers the lowpass_dt package)
+from simloop import SimLoop
+
+from lowpass_dt.coalescer import WriteCoalescer
+from lowpass_dt.config import apply_state_class, build_cfg
+from lowpass_dt.filter import LowpassCore
+from lowpass_dt.injector import TauInjector
+from lowpass_dt.outlier import outlier_filter
+from lowpass_dt.publisher import Publisher
+from lowpass_dt.sample import process_sample, sample_time
+from lowpass_dt.scheduler import TimerWheel
+
+
+# ------------------------------------------------------------
+# History sources (streamed, never fully loaded)
+# ------------------------------------------------------------
+def _parse_recorder_datetime(raw):
+    """Epoch seconds of a pre-schema-32 last_updated (naive UTC string)."""
+    value = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def iter_recorder(db_path, entity_id, *, start=None, end=None):
+    """Yield (timestamp, state) rows of entity_id from a recorder database."""
+
+    con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        has_meta = con.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'states_meta'"
+        ).fetchone()
+
+        if has_meta:
+            sql = (
+                "SELECT s.last_updated_ts, s.state FROM states s "
+                "JOIN states_meta m ON s.metadata_id = m.metadata_id "
+                "WHERE m.entity_id = ? AND s.last_updated_ts >= ? AND s.last_updated_ts < ? "
+                "ORDER BY s.last_updated_ts"
+            )
+        else:
+            # pre-2023.4 schema: entity_id stored on every row, float
+            # timestamps only from schema 32 (2023.2), ISO strings before
+            columns = {row[1] for row in con.execute("PRAGMA table_info(states)")}
+            if "last_updated_ts" in columns:
+                sql = (
+                    "SELECT last_updated_ts, state FROM states "
+                    "WHERE entity_id = ? AND last_updated_ts >= ? AND last_updated_ts < ? "
+                    "ORDER BY last_updated_ts"
+                )
+            else:
+                sql = (
+                    "SELECT last_updated, state FROM states "
+                    "WHERE entity_id = ? ORDER BY last_updated"
+                )
+                for raw_ts, state in con.execute(sql, (entity_id,)):
+                    ts = _parse_recorder_datetime(raw_ts)
+                    if (start is None or ts >= start) and (end is None or ts < end):
+                        yield ts, state
+                return
+
+        params = (
+            entity_id,
+            -math.inf if start is None else start,
+            math.inf if end is None else end,
+        )
+
+        for ts, state in con.execute(sql, params):
+            yield float(ts), state
+    finally:
+        con.close()
+
+
+def iter_csv(csv_path, entity_id=None):
+    """Yield (timestamp, state) rows from a history CSV export.
+
+    Expected columns: entity_id, state, last_changed (ISO 8601).
+    """
+
+    with open(csv_path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            if entity_id is not None and row.get("entity_id") != entity_id:
+                continue
+
+            raw_ts = row["last_changed"].replace("Z", "+00:00")
+            yield datetime.fromisoformat(raw_ts).timestamp(), row["state"]
+
+
+# ------------------------------------------------------------
+# Time-weighted tracking error (held output vs held source)
+# ------------------------------------------------------------
+class TrackingError:
+    def __init__(self, circular=None):
+        self.circular = circular
+        self.t = None
+        self.source = None
+        self.output = None
+        self.sq = 0.0
+        self.max_abs = 0.0
+        self.duration = 0.0
+
+    def advance(self, t):
+        if self.t is not None and self.source is not None and self.output is not None:
+            dt = t - self.t
+            if dt > 0:
+                err = self.output - self.source
+                if self.circular is not None:
+                    err = ((err + self.circular / 2) % self.circular) - self.circular / 2
+                self.sq += err * err * dt
+                self.max_abs = max(self.max_abs, abs(err))
+                self.duration += dt
+        self.t = t
+
+    @property
+    def rms(self):
+        return math.sqrt(self.sq / self.duration) if self.duration > 0 else 0.0
+
+
+# ------------------------------------------------------------
+# Stand-in for LowpassDtSensor (no Home Assistant)
+# ------------------------------------------------------------
+class ReplaySensor:
+    """Mirror of the LowpassDtSensor fields used by Publisher and process_sample."""
+
+    def __init__(self, cfg, loop, *, state_class=None, attributes=None):
+        self.cfg = cfg
+        self.entity_id = f"sensor.{cfg.prefix}replay"
+        self._unique_id_seed = self.entity_id
+        self.wheel = TimerWheel(loop, clock=loop.time)
+        self.runtime = SimpleNamespace(budget=None, store=None, writer=WriteCoalescer(loop), wheel=self.wheel)
+
+        self._source = SimpleNamespace(state=None, attributes=dict(attributes or {}))
+        if state_class is not None:
+            self._source.attributes["state_class"] = state_class
+
+        self.hass = SimpleNamespace(
+            loop=loop,
+            states=SimpleNamespace(get=lambda entity_id: self._source),
+        )
+
+        self._attr_native_unit_of_measurement = None
+        self._attr_icon = None
+        self._attr_device_class = None
+        self._attr_state_class = None
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
+
+        self._last_source_value = None
+        self._reset_pending = False
+        self._backfill_live = None
+
+        self.outlier = outlier_filter(cfg)
+        self.core = LowpassCore(cfg)
+        self.publisher = Publisher(self, cfg, self.core)
+        self.injector = TauInjector(
+            self.hass,
+            cfg,
+            self.core,
+            lambda: self._last_source_value,
+            self.publisher.publish_injected,
+            self.wheel,
+        )
+
+        self.tracking = TrackingError(cfg.circular)
+        self.source_events = 0
+        self.writes = 0
+        self.injected_writes = 0
+
+    # ------------------------------------------------------------
+    # Publisher sink
+    # ------------------------------------------------------------
+    def async_write_ha_state(self):
+        self.tracking.advance(self.hass.loop.time())
+        self.tracking.output = self._attr_native_value
+
+        self.writes += 1
+        if self.injector.silent:
+            self.injected_writes += 1
+
+    # ------------------------------------------------------------
+    # Same steps as LowpassDtSensor._handle_source_event
+    # ------------------------------------------------------------
+    def handle_source(self, x, ts):
+        """Source row recorded at ts (state and event time alike)."""
+        self.source_events += 1
+        self._source.state = x
+        self._source.last_updated_timestamp = ts
+
+        self.tracking.advance(ts)
+        self.tracking.source = x
+
+        now = sample_time(self, SimpleNamespace(time_fired_timestamp=ts), self._source)
+        process_sample(self, self._source, x, now)
+
+
+@dataclass
+class ReplayReport:
+    source_events: int
+    writes: int
+    injected_writes: int
+    write_ratio: float
+    rms_error: float
+    max_abs_error: float
+    duration: float
+
+
+# ------------------------------------------------------------
+# Replay driver
+# ------------------------------------------------------------
+def replay(rows, item, *, source="sensor.replay", state_class=None, attributes=None, tail=0.0):
+    """Run (timestamp, state) rows through the filter in simulated time.
+
+    item holds the same keys as a sensors[] YAML entry (tau, deadband, ...).
+    tail keeps simulating silence injection after the last row.
+    """
+
+    cfg = build_cfg(dict(item), source=source)
+
+    # same fallbacks as the sensor once the source state_class is known
+    if state_class is None and attributes:
+        state_class = attributes.get("state_class")
+    apply_state_class(cfg, state_class, source)
+
+    loop = None
+    sensor = None
+    t_last = None
+
+    for ts, state in rows:
+        try:
+            x = float(state)
+        except (TypeError, ValueError):
+            continue
+
+        if loop is None:
+            loop = SimLoop(ts)
+            sensor = ReplaySensor(cfg, loop, state_class=state_class, attributes=attributes)
+
+        # fire silence detection / injection due before this sample
+        loop.run_until(ts)
+        sensor.handle_source(x, ts)
+        loop.run_ready()
+        t_last = ts
+
+    if sensor is None:
+        return ReplayReport(0, 0, 0, 0.0, 0.0, 0.0, 0.0)
+
+    loop.run_until(t_last + tail)
+    sensor.tracking.advance(loop.time())
+    sensor.wheel.stop()
+
+    return ReplayReport(
+        source_events=sensor.source_events,
+        writes=sensor.writes,
+        injected_writes=sensor.injected_writes,
+        write_ratio=sensor.writes / sensor.source_events if sensor.source_events else 0.0,
+        rms_error=sensor.tracking.rms,
+        max_abs_error=sensor.tracking.max_abs,
+        duration=sensor.tracking.duration,
+    )
+
+
+def parse_params(pairs):
+    """Parse KEY=VALUE pairs into a sensors[] item (numbers as floats)."""
+    item = {}
+    for pair in pairs or ():
+        key, _, raw = pair.partition("=")
+        value = raw
+        if raw.lower() in ("true", "false"):
+            value = raw.lower() == "true"
+        else:
+            try:
+                value = float(raw)
+            except ValueError:
+                pass
+        item[key.strip()] = value
+    return item
+
+
+def open_rows(args):
+    if args.db:
+        return iter_recorder(args.db, args.entity, start=args.start, end=args.end)
+    return iter_csv(args.csv, args.entity)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--db", help="recorder SQLite database (home-assistant_v2.db)")
+    src.add_argument("--csv", help="history CSV export (entity_id,state,last_changed)")
+    parser.add_argument("--entity", required=True, help="source entity_id")
+    parser.add_argument("--start", type=float, help="start timestamp (epoch seconds)")
+    parser.add_argument("--end", type=float, help="end timestamp (epoch seconds)")
+    parser.add_argument("--state-class", help="source state_class (e.g. total_increasing)")
+    parser.add_argument("--tail", type=float, default=0.0, help="seconds simulated after the last row")
+    parser.add_argument("-p", "--param", action="append", metavar="KEY=VALUE", help="filter parameter, same keys as YAML")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show integration warnings")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.ERROR)
+
+    report = replay(
+        open_rows(args),
+        parse_params(args.param),
+        source=args.entity,
+        state_class=args.state_class,
+        tail=args.tail,
+    )
+    print(json.dumps(asdict(report), indent=2))
+
+
+if __name__ == "__main__":
+    main()
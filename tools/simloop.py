@@ -0,0 +1,71 @@
+"""Virtual-time event loop for offline simulation.
+
+Implements the small subset of asyncio.AbstractEventLoop used by the
+integration (time, call_soon, call_later, call_at) on a simulated clock
+that only advances when run_until() is called.
+"""
+
+import heapq
+import itertools
+
+
+class SimHandle:
+    __slots__ = ("when", "callback", "args", "cancelled")
+
+    def __init__(self, when, callback, args):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class SimLoop:
+    """Deterministic loop: callbacks run in (time, insertion) order."""
+
+    def __init__(self, start=0.0):
+        self.now = float(start)
+        self._queue = []
+        self._seq = itertools.count()
+
+    # ------------------------------------------------------------
+    # asyncio loop subset
+    # ------------------------------------------------------------
+    def time(self):
+        return self.now
+
+    def call_at(self, when, callback, *args):
+        handle = SimHandle(max(when, self.now), callback, args)
+        heapq.heappush(self._queue, (handle.when, next(self._seq), handle))
+        return handle
+
+    def call_later(self, delay, callback, *args):
+        return self.call_at(self.now + delay, callback, *args)
+
+    def call_soon(self, callback, *args):
+        return self.call_at(self.now, callback, *args)
+
+    call_soon_threadsafe = call_soon
+
+    # ------------------------------------------------------------
+    # Drive the clock
+    # ------------------------------------------------------------
+    def run_until(self, t):
+        """Run every callback due up to t, then set the clock to t."""
+        while self._queue and self._queue[0][0] <= t:
+            when, _, handle = heapq.heappop(self._queue)
+            self.now = max(self.now, when)
+            if not handle.cancelled:
+                handle.callback(*handle.args)
+
+        self.now = max(self.now, t)
+
+    def run_ready(self):
+        """Run callbacks due now (call_soon work) without moving the clock."""
+        self.run_until(self.now)
+
+    @property
+    def pending(self):
+        return sum(1 for _, _, h in self._queue if not h.cancelled)
@@ -0,0 +1,154 @@
+"""Parameter sweep over recorded traces, Pareto front of writes vs error.
+
+Evaluates every (tau, deadband_k_sigma, max_rate_dt, min_rate_dt)
+combination of the grid with the replay engine, spread over a process
+pool, and prints for each entity the Pareto-optimal settings: no other
+setting has both fewer writes and a lower RMS error.
+
+    python tools/sweep.py --db home-assistant_v2.db --entity sensor.a --entity sensor.b \\
+        --tau 30,60,120 --k-sigma 2,3,4 --max-rate-dt 10 --min-rate-dt 3600 -p outlier=reject
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from replay import iter_csv, iter_recorder, parse_params, replay
+
+
+# ------------------------------------------------------------
+# Trace cache (one compact copy per worker process and entity)
+# ------------------------------------------------------------
+_TRACES = {}
+
+
+def _load_trace(source, entity_id):
+    key = (source, entity_id)
+    trace = _TRACES.get(key)
+    if trace is not None:
+        return trace
+
+    kind, path = source
+    rows = iter_recorder(path, entity_id) if kind == "db" else iter_csv(path, entity_id)
+
+    ts = array("d")
+    values = array("d")
+    for t, state in rows:
+        try:
+            x = float(state)
+        except (TypeError, ValueError):
+            continue
+        ts.append(t)
+        values.append(x)
+
+    trace = _TRACES[key] = (ts, values)
+    return trace
+
+
+def _evaluate(task):
+    source, entity_id, params, tail = task
+    ts, values = _load_trace(source, entity_id)
+    report = replay(zip(ts, values), params, source=entity_id, tail=tail)
+    return entity_id, params, report
+
+
+# ------------------------------------------------------------
+# Grid + Pareto front
+# ------------------------------------------------------------
+def build_grid(taus, k_sigmas, max_rates, min_rates, fixed=None):
+    """Grid points; fixed holds further sensors[] keys shared by all points."""
+    grid = []
+    for tau, k, max_rate, min_rate in itertools.product(taus, k_sigmas, max_rates, min_rates):
+        # build_cfg would silently replace an invalid rate pair
+        if max_rate >= min_rate:
+            continue
+        grid.append({
+            **(fixed or {}),
+            "tau": tau,
+            "deadband_k_sigma": k,
+            "max_rate_dt": max_rate,
+            "min_rate_dt": min_rate,
+        })
+    return grid
+
+
+def pareto_front(results):
+    """results: list of (params, report). Minimize writes and rms_error."""
+    front = []
+    best_rms = None
+    for params, report in sorted(results, key=lambda r: (r[1].writes, r[1].rms_error)):
+        if best_rms is None or report.rms_error < best_rms:
+            front.append((params, report))
+            best_rms = report.rms_error
+    return front
+
+
+def sweep(source, entities, grid, *, workers=None, tail=0.0):
+    """Return {entity_id: [(params, report), ...]} for every grid point."""
+
+    tasks = [(source, eid, params, tail) for eid in entities for params in grid]
+    results = {eid: [] for eid in entities}
+
+    # entity-major order + chunks keep each worker on few traces
+    chunksize = max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_quiet) as pool:
+        for eid, params, report in pool.map(_evaluate, tasks, chunksize=chunksize):
+            results[eid].append((params, report))
+
+    return results
+
+
+def _quiet():
+    logging.basicConfig(level=logging.ERROR)
+
+
+def _floats(text):
+    return [float(v) for v in text.split(",") if v.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--db", help="recorder SQLite database (home-assistant_v2.db)")
+    src.add_argument("--csv", help="history CSV export (entity_id,state,last_changed)")
+    parser.add_argument("--entity", action="append", required=True, help="source entity_id (repeatable)")
+    parser.add_argument("--tau", type=_floats, default=[60.0])
+    parser.add_argument("--k-sigma", type=_floats, default=[2.0])
+    parser.add_argument("--max-rate-dt", type=_floats, default=[10.0])
+    parser.add_argument("--min-rate-dt", type=_floats, default=[3600.0])
+    parser.add_argument("--tail", type=float, default=0.0, help="seconds simulated after the last row")
+    parser.add_argument("-p", "--param", action="append", metavar="KEY=VALUE", help="fixed filter parameter, same keys as YAML")
+    parser.add_argument("--workers", type=int, help="process count (default: CPU count)")
+    parser.add_argument("--all", action="store_true", help="also output every evaluated point")
+    args = parser.parse_args(argv)
+
+    source = ("db", args.db) if args.db else ("csv", args.csv)
+    grid = build_grid(args.tau, args.k_sigma, args.max_rate_dt, args.min_rate_dt, parse_params(args.param))
+    results = sweep(source, args.entity, grid, workers=args.workers, tail=args.tail)
+
+    out = {}
+    for eid, points in results.items():
+        entry = {
+            "evaluated": len(points),
+            "pareto": [
+                {**params, "writes": r.writes, "rms_error": r.rms_error, "max_abs_error": r.max_abs_error}
+                for params, r in pareto_front(points)
+            ],
+        }
+        if args.all:
+            entry["points"] = [
+                {**params, "writes": r.writes, "rms_error": r.rms_error}
+                for params, r in points
+            ]
+        out[eid] = entry
+
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Synthetic irregular sensor traces for benchmarks and replay experiments.
+
+Every generator yields (timestamp, value) pairs with realistic timing:
+exponential inter-arrival times, bursts, long silences, counter resets
+(total_increasing) and circular wrap-around (angles in 0..360).
+"""
+
+import math
+import random
+
+TRACE_KINDS = ("irregular", "bursts", "silences", "counter", "angle")
+
+
+def _irregular(rng, n, t, mean_dt=10.0):
+    for _ in range(n):
+        t += rng.expovariate(1.0 / mean_dt)
+        yield t, 20.0 + 5.0 * math.sin(t / 3600.0) + rng.gauss(0.0, 0.2)
+
+
+def _bursts(rng, n, t, mean_dt=30.0):
+    emitted = 0
+    while emitted < n:
+        t += rng.expovariate(1.0 / mean_dt)
+        # occasional burst of fast updates (e.g. a chatty zigbee device)
+        size = rng.randint(5, 50) if rng.random() < 0.1 else 1
+        base = 500.0 + 200.0 * math.sin(t / 7200.0)
+        for _ in range(min(size, n - emitted)):
+            t += rng.uniform(0.05, 0.5)
+            yield t, base + rng.gauss(0.0, 15.0)
+            emitted += 1
+
+
+def _silences(rng, n, t, mean_dt=10.0):
+    level = 20.0
+    for _ in range(n):
+        if rng.random() < 0.002:
+            # long silence, then a step
+            t += rng.uniform(1800.0, 4 * 3600.0)
+            level += rng.gauss(0.0, 3.0)
+        else:
+            t += rng.expovariate(1.0 / mean_dt)
+        yield t, level + rng.gauss(0.0, 0.1)
+
+
+def _counter(rng, n, t, mean_dt=60.0):
+    total = rng.uniform(0.0, 1000.0)
+    for _ in range(n):
+        dt = rng.expovariate(1.0 / mean_dt)
+        t += dt
+        if rng.random() < 0.001:
+            # meter reset / replaced device
+            total = 0.0
+        total += max(0.0, rng.gauss(0.5, 0.2)) * dt / mean_dt
+        yield t, round(total, 3)
+
+
+def _angle(rng, n, t, mean_dt=5.0):
+    heading = rng.uniform(0.0, 360.0)
+    for _ in range(n):
+        t += rng.expovariate(1.0 / mean_dt)
+        # slow drift across the 0/360 boundary plus noise
+        heading = (heading + rng.gauss(0.5, 3.0)) % 360.0
+        yield t, round((heading + rng.gauss(0.0, 5.0)) % 360.0, 1)
+
+
+_GENERATORS = {
+    "irregular": _irregular,
+    "bursts": _bursts,
+    "silences": _silences,
+    "counter": _counter,
+    "angle": _angle,
+}
+
+
+def generate(kind, n, *, seed=0, start=1.7e9):
+    """Yield n (timestamp, value) samples of the given kind."""
+    if kind not in _GENERATORS:
+        raise ValueError(f"unknown trace kind {kind!r}, expected one of {TRACE_KINDS}")
+    rng = random.Random(seed)
+    return _GENERATORS[kind](rng, n, start + rng.uniform(0.0, 60.0))
+
+
+def interleave(kind, sensors, events_per_sensor, *, seed=0):
+    """Merge one trace per sensor into a single time-ordered event list.
+
+    Returns a list of (timestamp, sensor_index, value).
+    """
+    events = []
+    for i in range(sensors):
+        for t, x in generate(kind, events_per_sensor, seed=seed * 100003 + i):
+            events.append((t, i, x))
+    events.sort()
+    return events
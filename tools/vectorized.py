@@ -0,0 +1,201 @@
+"""NumPy struct-of-arrays step of many LowpassCores (benchmark baseline).
+
+update_many(cores, values, timestamps) gives the same state as calling
+core.update_synthetic(x, now) on every core, with each engine (first
+order, critical, Butterworth, Kalman; linear or circular) stepped as
+float64 arrays. bench.py times it against the scalar step the injector
+uses and checks that both agree.
+
+The integration keeps the scalar LowpassCore: the state lives in the
+core objects, and gathering it into arrays and writing it back costs
+about as much as the scalar step itself.
+"""
+
+from operator import attrgetter
+
+import numpy as np
+
+import _component  # noqa: F401  (registers the lowpass_dt package)
+
+from lowpass_dt.filter import (
+    _lowpass2_circular,
+    _lowpass2_linear,
+    _lowpass_circular,
+    _lowpass_kalman_circular,
+    _lowpass_kalman_linear,
+    _lowpass_linear,
+)
+
+
+# ------------------------------------------------------------
+# Vectorized LowpassCore.update_synthetic
+# ------------------------------------------------------------
+def update_many(cores, values, timestamps):
+    """Synthetic step of many cores at once; returns the dt of each core.
+
+    Cores are grouped by their shared CoreParams block (same engine and
+    settings), each group runs as one set of array operations. The state
+    stays in the LowpassCore objects: it is gathered, stepped and written
+    back.
+    """
+    dts = [0.0] * len(cores)
+    groups = {}
+
+    for i, core in enumerate(cores):
+        # not initialized: update_synthetic is a no-op
+        if core.y is None:
+            continue
+        groups.setdefault(core._p, []).append(i)
+
+    for p, members in groups.items():
+        batch = [cores[i] for i in members]
+        x = np.array([values[i] for i in members])
+        now = [timestamps[i] for i in members]
+
+        for i, dt in zip(members, _STEPS[p.lowpass](batch, p, x, now).tolist()):
+            dts[i] = dt
+
+    return dts
+
+
+_get_y = attrgetter("y")
+_get_t_prev = attrgetter("t_prev")
+_get_v = attrgetter("v")
+_get_kp = attrgetter("kp")
+_get_kq = attrgetter("kq")
+_get_kr = attrgetter("kr")
+
+
+def _gather(cores, get):
+    return np.fromiter(map(get, cores), float, len(cores))
+
+
+def _dt(cores, now):
+    """now - t_prev, never negative (t_prev None counts as dt = 0)."""
+    t_prev = list(map(_get_t_prev, cores))
+    if None in t_prev:
+        t_prev = [t_now if t is None else t for t, t_now in zip(t_prev, now)]
+    return np.maximum(np.array(now) - np.array(t_prev), 0.0)
+
+
+def _wrap(p, d):
+    return ((d + p.half) % p.circular) - p.half
+
+
+# ------------------------------------------------------------
+# First-order low-pass (dt clamped to tau)
+# ------------------------------------------------------------
+def _alpha(p, dt):
+    s = p.tau + dt
+    return np.where(s > 0, dt / np.where(s > 0, s, 1.0), 1.0)
+
+
+def _step_linear(cores, p, x, now):
+    dt = np.minimum(_dt(cores, now), p.tau)
+
+    y = _gather(cores, _get_y)
+    y = y + _alpha(p, dt) * (x - y)
+
+    for core, y_i, t in zip(cores, y.tolist(), now):
+        core.y = y_i
+        core.t_prev = t
+    return dt
+
+
+def _step_circular(cores, p, x, now):
+    dt = np.minimum(_dt(cores, now), p.tau)
+
+    y = _gather(cores, _get_y)
+    y = (y + _alpha(p, dt) * _wrap(p, x - y)) % p.circular
+
+    for core, y_i, t in zip(cores, y.tolist(), now):
+        core.y = y_i
+        core.t_prev = t
+    return dt
+
+
+# ------------------------------------------------------------
+# Second-order engines (exact step, see filter._response2)
+# ------------------------------------------------------------
+def _response2(p, e0, v0, dt):
+    k = np.exp(-p.decay * dt)
+
+    if p.zeta >= 1.0:
+        c = (v0 + p.w * e0) * dt
+        return k * (e0 + c), k * (v0 - p.w * c)
+
+    cs = np.cos(p.wd * dt)
+    sn = np.sin(p.wd * dt) / p.wd
+    return (
+        k * (e0 * cs + (v0 + p.decay * e0) * sn),
+        k * (v0 * cs - (p.w * p.w * e0 + p.decay * v0) * sn),
+    )
+
+
+def _step2(cores, p, x, now, circular):
+    dt = np.minimum(_dt(cores, now), p.tau)
+
+    e0 = _gather(cores, _get_y) - x
+    if circular:
+        e0 = _wrap(p, e0)
+
+    e, v = _response2(p, e0, _gather(cores, _get_v), dt)
+    y = x + e
+    if circular:
+        y = y % p.circular
+
+    for core, y_i, v_i, t in zip(cores, y.tolist(), v.tolist(), now):
+        core.y = y_i
+        core.v = v_i
+        core.t_prev = t
+    return dt
+
+
+def _step2_linear(cores, p, x, now):
+    return _step2(cores, p, x, now, False)
+
+
+def _step2_circular(cores, p, x, now):
+    return _step2(cores, p, x, now, True)
+
+
+# ------------------------------------------------------------
+# Kalman engine (predict + correct, no noise learning, no dt clamping)
+# ------------------------------------------------------------
+def _step_kalman(cores, p, x, now, circular):
+    dt = _dt(cores, now)
+
+    p_pred = _gather(cores, _get_kp) + _gather(cores, _get_kq) * dt
+    s = p_pred + _gather(cores, _get_kr)
+    k = np.where(s > 0, p_pred / np.where(s > 0, s, 1.0), 1.0)
+
+    y = _gather(cores, _get_y)
+    if circular:
+        y = (y + k * _wrap(p, x - y)) % p.circular
+    else:
+        y = y + k * (x - y)
+
+    for core, y_i, kp_i, t in zip(cores, y.tolist(), ((1.0 - k) * p_pred).tolist(), now):
+        core.y = y_i
+        core.kp = kp_i
+        core.t_prev = t
+    return dt
+
+
+def _step_kalman_linear(cores, p, x, now):
+    return _step_kalman(cores, p, x, now, False)
+
+
+def _step_kalman_circular(cores, p, x, now):
+    return _step_kalman(cores, p, x, now, True)
+
+
+# scalar step function (CoreParams.lowpass) -> vectorized equivalent
+_STEPS = {
+    _lowpass_linear: _step_linear,
+    _lowpass_circular: _step_circular,
+    _lowpass2_linear: _step2_linear,
+    _lowpass2_circular: _step2_circular,
+    _lowpass_kalman_linear: _step_kalman_linear,
+    _lowpass_kalman_circular: _step_kalman_circular,
+}